@@ -166,6 +166,7 @@ def remove_celery_files():
         Path("config", "celery_app.py"),
         Path("{{ cookiecutter.project_slug }}", "users", "tasks.py"),
         Path("{{ cookiecutter.project_slug }}", "users", "tests", "test_tasks.py"),
+        Path("{{ cookiecutter.project_slug }}", "base", "tasks.py"),
     ]
     for file_path in file_paths:
         safe_unlink(file_path)
@@ -353,6 +354,20 @@ def remove_aws_dockerfile():
 def remove_drf_starter_files():
     safe_unlink(Path("config", "api_router.py"))
     safe_unlink(Path("{{cookiecutter.project_slug}}", "users", "api", "serializers.py"))
+    for test_file in [
+        "views.py",
+        "test_throttling.py",
+        "test_pagination.py",
+        "test_eager_loading.py",
+        "test_conditional.py",
+        "test_response_cache.py",
+        "test_bulk.py",
+        "test_trash_views.py",
+        "test_middlewares.py",
+        "test_load_shedding.py",
+        "test_export.py",
+    ]:
+        safe_unlink(Path("{{cookiecutter.project_slug}}", "base", "tests", test_file))
 
 
 def remove_ninja_starter_files():
@@ -2,10 +2,15 @@ from django.contrib.admin.views.decorators import staff_member_required
 from ninja import NinjaAPI
 from ninja.security import SessionAuth
 
+from {{ cookiecutter.project_slug }}.base.transactions import atomic_operation
+
 api = NinjaAPI(
     urls_namespace="api",
     auth=SessionAuth(),
     docs_decorator=staff_member_required,
 )
+# The API views are not atomic, ATOMIC_REQUESTS is applied per operation so
+# routers can opt their reads out with `non_atomic_safe_router`
+api.add_decorator(atomic_operation, mode="view")
 
 api.add_router("/users/", "{{ cookiecutter.project_slug }}.users.api.views.router")
@@ -162,6 +162,11 @@ AUTH_PASSWORD_VALIDATORS = [
 # ------------------------------------------------------------------------------
 # https://docs.djangoproject.com/en/dev/ref/settings/#middleware
 MIDDLEWARE = [
+{%- if cookiecutter.rest_api == 'DRF' %}
+    "{{ cookiecutter.project_slug }}.base.middlewares.ThrottleMiddleware",
+    "{{ cookiecutter.project_slug }}.base.middlewares.LoadSheddingMiddleware",
+    "{{ cookiecutter.project_slug }}.base.middlewares.ConcurrencyLimitMiddleware",
+{%- endif %}
     "django.middleware.security.SecurityMiddleware",
 {%- if cookiecutter.rest_api != 'None' %}
     "corsheaders.middleware.CorsMiddleware",
@@ -374,6 +379,10 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 25,
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_THROTTLE_CLASSES": (
+        "{{ cookiecutter.project_slug }}.base.throttling.ScopedRequestThrottles",
+        "{{ cookiecutter.project_slug }}.base.throttling.ConcurrentRequestThrottles",
+    ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_FILTER_BACKENDS": (
         "django_filters.rest_framework.DjangoFilterBackend",
@@ -382,6 +391,46 @@ REST_FRAMEWORK = {
     ),
 }
 
+# Throttle policy per scope, see {{ cookiecutter.project_slug }}.base.throttling.
+# "algorithm" is one of "escalating", "gcra", "sliding_window" or a dotted path.
+# Views and actions opt in with `throttle_scope` and use up `throttle_cost`
+# (default 1) of the "request_limit". "tiers" overrides the policy for
+# "anonymous", "user", "staff" or "superuser"; None disables throttling.
+THROTTLE_SCOPES = {
+    "anonymous": {"algorithm": "escalating", "timeout": 60, "request_limit": 5},
+    "token_obtain": {"algorithm": "escalating", "timeout": 60, "request_limit": 5},
+    "trash": {"algorithm": "gcra", "timeout": 3600, "request_limit": 100},
+    # An export costs 10, so 10 exports an hour
+    "export": {"algorithm": "gcra", "timeout": 3600, "request_limit": 100},
+    # In-flight requests per user or ident, slots expire after "timeout"
+    "concurrency": {
+        "timeout": 60,
+        "request_limit": 8,
+        "tiers": {"anonymous": {"request_limit": 2}, "superuser": None},
+    },
+}
+# Idents known to be throttled are rejected by each worker without a cache
+# round trip. Resets are picked up after at most the sync interval (seconds).
+THROTTLE_DENY_CACHE_SIZE = 10_000
+THROTTLE_DENY_CACHE_SYNC_INTERVAL = 1
+# Anonymous requests to these urls are throttled by ThrottleMiddleware, before
+# the session, authentication and the database transaction are set up.
+THROTTLE_MIDDLEWARE_SCOPE = "token_obtain"
+THROTTLE_MIDDLEWARE_URLS_REGEX = r"^/api/token/$"
+# In shadow mode throttles only count their decisions without rejecting any
+# request; a scope can set "shadow" to override it. Counts are written to cache
+# at most every flush interval (seconds), see get_throttle_decision_counts.
+THROTTLE_SHADOW_MODE = env.bool("DJANGO_THROTTLE_SHADOW_MODE", default=False)
+THROTTLE_DECISION_FLUSH_INTERVAL = 10
+# LoadSheddingMiddleware sheds low priority requests once the queueing delay
+# stays above the target (seconds) for a whole interval. The delay is read from
+# X-Request-Start, sent by the proxy or by the gunicorn worker (see
+# gunicorn.conf.py). Without it, a request taking the last of the
+# LOAD_SHEDDING_MAX_IN_FLIGHT threads of its worker counts as queued.
+LOAD_SHEDDING_TARGET = 0.05
+LOAD_SHEDDING_INTERVAL = 0.5
+LOAD_SHEDDING_MAX_IN_FLIGHT = env.int("GUNICORN_THREADS", default=4)
+
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
 CORS_URLS_REGEX = r"^/api/.*$"
 
@@ -425,6 +474,20 @@ AUDITLOG_EXCLUDE_TRACKING_FIELDS = (
     "deleted_at",
 )
 
+# Pagination
+# ------------------------------------------------------------------------------
+# EstimatedCountPagination and the admin changelists report the PostgreSQL row
+# estimate instead of running COUNT(*) once it goes over this many rows.
+ESTIMATED_COUNT_THRESHOLD = 10_000
+# Exact counts are cached (seconds) until the next write to the model
+COUNT_CACHE_TIMEOUT = 300
+
+# Trash
+# ------------------------------------------------------------------------------
+# empty_trash and restore_all work through the trash this many rows per
+# transaction{% if cookiecutter.use_celery == 'y' %} in a Celery task{% endif %}. Their progress is kept (seconds) for the status endpoint.
+TRASH_JOB_BATCH_SIZE = 1000
+TRASH_JOB_TIMEOUT = 60 * 60 * 24
 
 
 # STATIC & MEDIA
@@ -9,14 +9,15 @@ from django.urls import include, path, reverse
 from django.views.generic import TemplateView
 {%- if cookiecutter.rest_api == 'DRF' %}
 from drf_spectacular.views import SpectacularSwaggerView, SpectacularRedocView, SpectacularAPIView
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-)
+from rest_framework_simplejwt.views import TokenRefreshView
+
+from {{ cookiecutter.project_slug }}.base.api.views import ThrottledTokenObtainPairView
 def home(request):
     return redirect(reverse("api-docs"))
 {%- elif cookiecutter.rest_api == 'Django Ninja' %}
 
+from {{ cookiecutter.project_slug }}.base.transactions import non_atomic_urls
+
 from .api import api
 {%- endif %}
 
@@ -46,7 +47,11 @@ urlpatterns += [
     # API base url
     path("api/", include("config.api_router")),
     # DRF Simple JWT
-    path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path(
+        "api/token/",
+        ThrottledTokenObtainPairView.as_view(),
+        name="token_obtain_pair",
+    ),
     path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("api/schema/", SpectacularAPIView.as_view(), name="api-schema"),
     path(
@@ -65,7 +70,7 @@ urlpatterns += [
 # API URLS
 urlpatterns += [
     # API base url
-    path("api/", api.urls),
+    path("api/", non_atomic_urls(api.urls)),
 ]
 {%- endif %}
 
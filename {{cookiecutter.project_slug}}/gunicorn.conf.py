@@ -3,7 +3,8 @@ import os
 bind = "0.0.0.0:8000"
 
 workers = int(os.environ.get("GUNICORN_WORKERS", "8"))
-worker_class = "gthread"
+# gthread, adding X-Request-Start with the time spent waiting for a thread
+worker_class = "{{ cookiecutter.project_slug }}.base.workers.QueueTimingThreadWorker"
 threads = int(os.environ.get("GUNICORN_THREADS", "4"))
 proc_name = os.environ.get("GUNICORN_PROCESS_NAME", "{{ cookiecutter.project_slug }}")
 
@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 from {{ cookiecutter.project_slug }}.base.models import BaseModel
+from {{ cookiecutter.project_slug }}.base.pagination import EstimatedCountPaginator
 
 
 class BaseModelAdmin(admin.ModelAdmin):
@@ -8,11 +9,12 @@ class BaseModelAdmin(admin.ModelAdmin):
     list_display = ["is_deleted"]
     list_filter = ["is_deleted"]
     actions = ["restore"]
+    paginator = EstimatedCountPaginator
+    # Skips the COUNT(*) of the whole table next to the filtered one
+    show_full_result_count = False
 
     def restore(self, request, queryset):
-        queryset.filter(is_deleted=True).update(
-            is_deleted=False, deleted_at=None, deleted_by=None
-        )
+        queryset.restore()
 
     restore.short_description = "Restore selected %(verbose_name_plural)s"
 
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+if TYPE_CHECKING:
+    import datetime
+
+    from django.http import HttpResponseBase
+
+
+def get_etag(*validators) -> str:
+    return (
+        f'"{hashlib.md5(repr(validators).encode(), usedforsecurity=False).hexdigest()}"'
+    )
+
+
+def set_validators(
+    response: HttpResponseBase,
+    etag: str,
+    last_modified: datetime.datetime | None,
+):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+
+
+def get_not_modified_response(
+    request,
+    etag: str,
+    last_modified: datetime.datetime | None,
+) -> HttpResponseBase | None:
+    """
+    Returns a 304 when the `If-None-Match` or `If-Modified-Since` of the
+    request match the validators, None otherwise
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp())
+        if last_modified is not None
+        else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import serializers
+from rest_framework.relations import RelatedField
+
+from {{ cookiecutter.project_slug }}.base.api.serializers import RecursiveField
+
+if TYPE_CHECKING:
+    from django.db.models import Model
+
+# Levels of a `RecursiveField` loaded eagerly, deeper ones are queried lazily
+RECURSIVE_FIELD_DEPTH = 2
+
+
+def _get_relation(model: type[Model], attr: str, *, prefetch: bool):
+    """
+    Returns the relation an attribute of the model follows and its name in a
+    `select_related` or `prefetch_related` lookup, or None. Prefetched
+    relations, which include every to many one, are named by their accessor,
+    joined reverse one to one relations by their query name.
+    """
+    for relation in model._meta.related_objects:  # noqa: SLF001
+        if relation.get_accessor_name() == attr:
+            if prefetch or relation.one_to_many or relation.many_to_many:
+                return relation, attr
+            return relation, relation.field.related_query_name()
+
+    try:
+        field = model._meta.get_field(attr)  # noqa: SLF001
+    except FieldDoesNotExist:
+        return None, None
+    if not field.is_relation or (field.auto_created and not field.concrete):
+        return None, None
+    return field, field.name
+
+
+def _collect(  # noqa: PLR0913
+    serializer,
+    model,
+    path: tuple,
+    plan: tuple[set, set],
+    *,
+    prefetch: bool,
+    depth: int,
+):
+    for field in serializer.fields.values():
+        if field.write_only or (isinstance(field, RecursiveField) and not depth):
+            continue
+
+        child = field.child if isinstance(field, serializers.ListSerializer) else field
+        if field.source == "*":
+            if isinstance(child, serializers.Serializer):
+                _collect(child, model, path, plan, prefetch=prefetch, depth=depth)
+            continue
+
+        current, lookup, many = model, list(path), prefetch
+        for index, attr in enumerate(field.source_attrs):
+            relation, name = _get_relation(current, attr, prefetch=many)
+            if relation is None:
+                break
+
+            to_many = relation.many_to_many or relation.one_to_many
+            pk_only = (
+                isinstance(field, RelatedField) and field.use_pk_only_optimization()
+            )
+            if (
+                index == len(field.source_attrs) - 1
+                and pk_only
+                and relation.concrete
+                and not to_many
+            ):
+                # Reads the foreign key column
+                break
+
+            many = many or to_many
+            lookup.append(name)
+            plan[many].add(LOOKUP_SEP.join(lookup))
+            current = relation.related_model
+        else:
+            if isinstance(child, serializers.Serializer):
+                _collect(
+                    child,
+                    current,
+                    tuple(lookup),
+                    plan,
+                    prefetch=many,
+                    depth=depth,
+                )
+            elif isinstance(field, RecursiveField):
+                _collect(
+                    type(field.parent)(),
+                    current,
+                    tuple(lookup),
+                    plan,
+                    prefetch=many,
+                    depth=depth - 1,
+                )
+
+
+def _drop_prefixes(lookups: set[str]) -> tuple[str, ...]:
+    return tuple(
+        sorted(
+            lookup
+            for lookup in lookups
+            if not any(other.startswith(lookup + LOOKUP_SEP) for other in lookups)
+        ),
+    )
+
+
+@functools.cache
+def get_eager_loading(
+    serializer_class: type[serializers.Serializer],
+) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """
+    Returns the `select_related` and `prefetch_related` lookups of the
+    relations the serializer reads, through nested serializers, `source=`
+    paths and `RecursiveField`. Single valued relations are joined, anything
+    under a to many relation is prefetched. Computed once per serializer class.
+    """
+    model = getattr(getattr(serializer_class, "Meta", None), "model", None)
+    if model is None:
+        return (), ()
+
+    plan = (set(), set())
+    _collect(
+        serializer_class(),
+        model,
+        (),
+        plan,
+        prefetch=False,
+        depth=RECURSIVE_FIELD_DEPTH,
+    )
+    return _drop_prefixes(plan[0]), _drop_prefixes(plan[1])
@@ -11,6 +11,29 @@ from {{ cookiecutter.project_slug }}.base.api.serializers import ResponseSeriali
 from {{ cookiecutter.project_slug }}.base.exceptions import BaseException
 
 
+def get_throttled_detail(wait: float | None) -> str:
+    default_detail = "Too many attempts."
+    extra_detail_singular = "Please try again after {wait} second."
+    extra_detail_plural = "Please try again after {wait} seconds."
+
+    if wait is None:
+        return default_detail
+
+    wait = math.ceil(wait)
+    return " ".join(
+        (
+            default_detail,
+            force_str(
+                ngettext(
+                    extra_detail_singular.format(wait=wait),
+                    extra_detail_plural.format(wait=wait),
+                    wait,
+                ),
+            ),
+        ),
+    )
+
+
 def custom_exception_handler(exc, context):
     response = exception_handler(exc, context)
 
@@ -27,29 +50,9 @@ def custom_exception_handler(exc, context):
             status=exc.status_code,
         )
     if isinstance(exc, Throttled):
-        default_detail = "Too many attempts."
-        extra_detail_singular = "Please try again after {wait} second."
-        extra_detail_plural = "Please try again after {wait} seconds."
-
-        if exc.wait is not None:
-            wait = math.ceil(exc.wait)
-            detail = " ".join(
-                (
-                    default_detail,
-                    force_str(
-                        ngettext(
-                            extra_detail_singular.format(wait=wait),
-                            extra_detail_plural.format(wait=wait),
-                            wait,
-                        ),
-                    ),
-                ),
-            )
-        else:
-            detail = default_detail
-
         return Response(
-            {"detail": detail}, status=status.HTTP_429_TOO_MANY_REQUESTS,
+            {"detail": get_throttled_detail(exc.wait)},
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
         )
 
     return response
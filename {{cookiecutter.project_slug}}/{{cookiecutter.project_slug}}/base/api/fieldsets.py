@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Model
+from django.db.models import Prefetch
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import PrimaryKeyRelatedField
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from rest_framework.fields import Field
+
+FIELDS_QUERY_PARAM = "fields"
+EXPAND_QUERY_PARAM = "expand"
+
+
+def _parse_names(value: str) -> set[str]:
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def get_sparse_fieldset(request) -> tuple[set[str] | None, set[str] | None]:
+    """
+    Returns the names in `?fields=` and `?expand=` of a read request, or None
+    for the ones absent.
+
+    `fields` keeps only the listed fields. When `expand` is given, the nested
+    objects not listed in it are rendered as their primary key.
+    """
+    query_params = getattr(request, "query_params", None)
+    if query_params is None or request.method not in SAFE_METHODS:
+        return None, None
+
+    fields = expand = None
+    if FIELDS_QUERY_PARAM in query_params:
+        fields = _parse_names(query_params[FIELDS_QUERY_PARAM])
+    if EXPAND_QUERY_PARAM in query_params:
+        expand = _parse_names(query_params[EXPAND_QUERY_PARAM])
+    return fields, expand
+
+
+def get_field_roots(fields: dict[str, Field]) -> dict[str, bool] | None:
+    """
+    Maps the first attribute each bound serializer field reads on the instance
+    to whether the field follows it to the related objects, as opposed to
+    reading the primary key only. Returns None when a field may read anything,
+    e.g. `source="*"`.
+    """
+    roots = {}
+    for field in fields.values():
+        if field.source == "*":
+            return None
+
+        root, *rest = field.source_attrs
+        follows = bool(rest) or not isinstance(field, PrimaryKeyRelatedField)
+        roots[root] = roots.get(root, False) or follows
+    return roots
+
+
+def prune_lookups(
+    lookups: Iterable[str | Prefetch],
+    roots: dict[str, bool],
+) -> list[str | Prefetch]:
+    """
+    Drops the `select_related` or `prefetch_related` lookups no field follows
+    """
+    pruned = []
+    for lookup in lookups:
+        path = lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+        if roots.get(path.split(LOOKUP_SEP)[0]):
+            pruned.append(lookup)
+    return pruned
+
+
+def get_only_fields(
+    model: type[Model],
+    roots: dict[str, bool],
+    ordering: Iterable[str] = (),
+) -> list[str] | None:
+    """
+    Returns the columns to load with `only()` for the fields and the ordering
+    read on the instances, or None when one of them is not a model field
+    """
+    names = {model._meta.pk.name}  # noqa: SLF001
+    for name in (*roots, *(field.lstrip("-") for field in ordering)):
+        if name == "pk":
+            continue
+        if LOOKUP_SEP in name:
+            return None
+        try:
+            field = model._meta.get_field(name)  # noqa: SLF001
+        except FieldDoesNotExist:
+            return None
+        if field.concrete and not field.many_to_many:
+            names.add(field.name)
+    return sorted(names)
@@ -1,26 +1,78 @@
+import hashlib
 import logging
 from collections.abc import Callable, Iterable
 from typing import Generic, TypeVar
 
 from django.core.cache import cache
-from django.db.models import Prefetch, QuerySet
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.db.models import Count, Max, Prefetch, QuerySet
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
 from django_filters import FilterSet
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from {{ cookiecutter.project_slug }}.base.api.conditional import (
+    get_etag,
+    get_not_modified_response,
+    set_validators,
+)
+from {{ cookiecutter.project_slug }}.base.api.eager_loading import get_eager_loading
+from {{ cookiecutter.project_slug }}.base.api.fieldsets import (
+    get_field_roots,
+    get_only_fields,
+    get_sparse_fieldset,
+    prune_lookups,
+)
+from {{ cookiecutter.project_slug }}.base.api.pagination import KeysetPagination
 from {{ cookiecutter.project_slug }}.base.api.permissions import (
     SuperUserOnlyPermission,
     ReadOnlyPermission,
+    checks_objects,
 )
 from {{ cookiecutter.project_slug }}.base.api.request import BaseRequest
 from {{ cookiecutter.project_slug }}.base.api.serializers import (
+    BaseListSerializer,
     BaseModelSerializer,
     EmptySerializer,
     ResponseSerializer,
+    TrashJobSerializer,
+)
+from {{ cookiecutter.project_slug }}.base.api.streaming import (
+    CSVRenderer,
+    NDJSONRenderer,
+    iterate_in_chunks,
+    serialize_in_chunks,
+    stream_csv,
+    stream_json_array,
+    stream_ndjson,
 )
-from {{ cookiecutter.project_slug }}.base.exceptions import BadRequest, Forbidden
+from {{ cookiecutter.project_slug }}.base.caching import (
+    get_cached_aggregate,
+    get_model_generation,
+    get_queryset_digest,
+)
+from {{ cookiecutter.project_slug }}.base.exceptions import BadRequest, Forbidden, NotFound
 from {{ cookiecutter.project_slug }}.base.models import BaseModel
+{%- if cookiecutter.use_celery == 'y' %}
+from {{ cookiecutter.project_slug }}.base.tasks import run_trash_job_task
+{%- endif %}
+from {{ cookiecutter.project_slug }}.base.transactions import non_atomic_requests
+from {{ cookiecutter.project_slug }}.base.transactions import non_atomic_safe_requests
+from {{ cookiecutter.project_slug }}.base.trash import (
+    EMPTY_TRASH,
+    RESTORE_ALL,
+    create_trash_job,
+    get_trash_job,
+{%- if cookiecutter.use_celery == 'n' %}
+    run_trash_job,
+{%- endif %}
+)
 
 _ModelT = TypeVar("_ModelT", bound=BaseModel)
 
@@ -30,6 +82,17 @@ logger = logging.getLogger(__name__)
 class BaseModelViewSetMixin(Generic[_ModelT]):
     allow_view_deleted = True
     disable_pagination = False
+    # Set to e.g. CachedCountPagination to opt out of keyset pagination
+    pagination_class = KeysetPagination
+    # Rows read per server-side cursor fetch when streaming
+    stream_chunk_size = 2000
+    # Model fields exported by reading plain values instead of serializing the
+    # objects, much cheaper but skips the serializer. None exports the
+    # serializer fields.
+    export_fields: Iterable[str] | None = None
+    throttle_scope: str | None = None
+    throttle_cost = 1
+    load_shedding_priority = "normal"
     queryset: QuerySet
     request: BaseRequest
     model: _ModelT
@@ -38,11 +101,44 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
     serializer_class = BaseModelSerializer
     select_related: Iterable[str] = ["created_by", "updated_by", "deleted_by"]
     prefetch_related: Iterable[str | Prefetch] = []
+    # Add the lookups of the relations the serializer reads to the ones above
+    derive_eager_loading = True
+    # Answer the If-None-Match of list and retrieve, and the If-Modified-Since of
+    # retrieve, with a 304, validated by updated_at. Writes not touching
+    # updated_at go unnoticed.
+    conditional_requests = True
+    # Cache the list and retrieve responses (seconds) until the next write to
+    # the model, None disables it. Responses are shared between users of the
+    # same kind unless cached per user. Retrieve is not cached when a
+    # permission checks the object, a hit would skip the check.
+    response_cache_timeout: int | None = None
+    response_cache_per_user = True
+    # Run GET, HEAD and OPTIONS requests in the ATOMIC_REQUESTS transaction.
+    # Disable it for read heavy viewsets to spare them the BEGIN/COMMIT,
+    # writes stay atomic.
+    atomic_safe_requests = True
+    # Run every request in the ATOMIC_REQUESTS transaction. Disabled for the
+    # actions managing their own transactions, e.g. `empty_trash`.
+    atomic_requests = True
 
     get_serializer: Callable[..., BaseModelSerializer]
+    get_serializer_class: Callable[..., type[BaseModelSerializer]]
     get_object: Callable[..., _ModelT]
+    check_object_permissions: Callable[..., None]
+    get_permissions: Callable[..., list]
     filter_queryset: Callable[..., QuerySet[_ModelT]]
     get_serializer_context: Callable[..., dict]
+    paginate_queryset: Callable[..., list | None]
+    get_paginated_response: Callable[..., Response]
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)  # type: ignore[misc]
+        if not initkwargs.get("atomic_requests", cls.atomic_requests):
+            view = non_atomic_requests(view)
+        elif not initkwargs.get("atomic_safe_requests", cls.atomic_safe_requests):
+            view = non_atomic_safe_requests(view)
+        return view
 
     def get_serializer_context(self):
         """
@@ -69,11 +165,61 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
         else:
             queryset = self.model.objects.all()
 
-        return (
-            queryset
-            .select_related(*self.select_related)
-            .prefetch_related(*self.prefetch_related)
+        select_related, prefetch_related = self.get_eager_loading()
+        only = None
+        if any(names is not None for names in get_sparse_fieldset(self.request)):
+            # Only load what the fields requested read
+            roots = get_field_roots(self.get_serializer().fields)
+            if roots is not None:
+                select_related = prune_lookups(select_related, roots)
+                prefetch_related = prune_lookups(prefetch_related, roots)
+                only = get_only_fields(
+                    queryset.model,
+                    roots,
+                    self.get_paginator_ordering(queryset),
+                )
+
+        # Without lookups select_related() would follow every foreign key
+        if select_related:
+            queryset = queryset.select_related(*select_related)
+        queryset = queryset.prefetch_related(*prefetch_related)
+        if only is not None:
+            queryset = queryset.only(*only)
+        return queryset
+
+    def get_eager_loading(self) -> tuple[list[str], list[str | Prefetch]]:
+        """
+        The declared `select_related` and `prefetch_related`, followed by the
+        lookups derived from the serializer, see `get_eager_loading`
+        """
+        select_related, prefetch_related = (
+            list(self.select_related),
+            list(self.prefetch_related),
         )
+        if self.derive_eager_loading:
+            derived_select_related, derived_prefetch_related = get_eager_loading(
+                self.get_serializer_class(),
+            )
+            select_related += [
+                lookup
+                for lookup in derived_select_related
+                if lookup not in select_related
+            ]
+            prefetch_related += [
+                lookup
+                for lookup in derived_prefetch_related
+                if lookup not in prefetch_related
+            ]
+        return select_related, prefetch_related
+
+    def get_paginator_ordering(self, queryset: QuerySet[_ModelT]) -> Iterable[str]:
+        """
+        The fields the paginator reads on the instances to build its cursors
+        """
+        get_ordering = getattr(self.paginator, "get_ordering", None)
+        if get_ordering is None:
+            return ()
+        return get_ordering(self.request, queryset, self)
 
     def perform_destroy(self, instance):
         try:
@@ -82,6 +228,35 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
             logger.error(f"This instance doesn't have deleted_by field. Calling without deleted_by: {e}")
             return instance.delete()
 
+    def get_streaming_response(
+        self,
+        queryset: QuerySet[_ModelT],
+    ) -> StreamingHttpResponse:
+        """
+        Streams the queryset as a JSON array, serialized one chunk at a time
+        """
+        rows = serialize_in_chunks(
+            queryset,
+            self.get_serializer,
+            self.stream_chunk_size,
+        )
+        return StreamingHttpResponse(
+            stream_json_array(rows),
+            content_type="application/json",
+        )
+
+    def get_etag(self, *validators) -> str:
+        """
+        ETag of the validators for the representation the request asks for
+        """
+        return get_etag(
+            self.model._meta.label_lower,  # noqa: SLF001
+            *validators,
+            self.request.get_full_path(),
+            self.request.user.pk,
+            self.request.accepted_media_type,
+        )
+
     @property
     def paginator(self):
         """
@@ -99,6 +274,15 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
 
     @extend_schema(
         request=EmptySerializer,
+        parameters=[
+            OpenApiParameter(
+                "stream",
+                OpenApiTypes.BOOL,
+                description=(
+                    "Stream every deleted object as a JSON array instead of a page."
+                ),
+            ),
+        ],
     )
     @action(
         detail=False,
@@ -106,10 +290,11 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
         url_path="deleted",
         url_name="deleted",
         permission_classes=[SuperUserOnlyPermission],
+        throttle_scope="trash",
     )
     def deleted(self, request, *args, **kwargs):
         """
-        List all deleted objects.
+        List the deleted objects, filtered and paginated like the main list.
         """
         if not self.allow_view_deleted:
             raise Forbidden(
@@ -117,10 +302,86 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
                 "View Deleted Not Allowed",
             )
 
-        queryset = self.get_queryset().filter(is_deleted=True)
+        queryset = self.filter_queryset(self.get_queryset().filter(is_deleted=True))
+
+        if request.query_params.get("stream") in ("1", "true", "True"):
+            return self.get_streaming_response(queryset)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    def get_export_rows(
+        self,
+        queryset: QuerySet[_ModelT],
+    ) -> tuple[list[str], Iterable[dict]]:
+        """
+        Returns the exported field names and an iterator of rows read
+        `stream_chunk_size` at a time
+        """
+        if self.export_fields is not None:
+            fieldnames = list(self.export_fields)
+            values = queryset.prefetch_related(None).values(*fieldnames)
+            rows = (
+                row
+                for chunk in iterate_in_chunks(values, self.stream_chunk_size)
+                for row in chunk
+            )
+            return fieldnames, rows
+
+        fieldnames = [
+            name
+            for name, field in self.get_serializer().fields.items()
+            if not field.write_only
+        ]
+        return fieldnames, serialize_in_chunks(
+            queryset,
+            self.get_serializer,
+            self.stream_chunk_size,
+        )
+
+    @extend_schema(
+        request=EmptySerializer,
+        responses=OpenApiTypes.STR,
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        url_name="export",
+        renderer_classes=[CSVRenderer, NDJSONRenderer],
+        throttle_scope="export",
+        throttle_cost=10,
+        load_shedding_priority="low",
+    )
+    def export(self, request, *args, **kwargs):
+        """
+        Stream every object matching the filters of the list as CSV, or NDJSON
+        with `?format=ndjson` or `Accept: application/x-ndjson`.
+        """
+        export_format = request.accepted_renderer.format
+        queryset = self.filter_queryset(self.get_queryset())
+        fieldnames, rows = self.get_export_rows(queryset)
+
+        if export_format == "csv":
+            response = StreamingHttpResponse(
+                stream_csv(rows, fieldnames),
+                content_type="text/csv",
+            )
+        else:
+            response = StreamingHttpResponse(
+                stream_ndjson(rows),
+                content_type="application/x-ndjson",
+            )
+
+        filename = f"{self.model._meta.model_name}.{export_format}"  # noqa: SLF001
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
     @extend_schema(
         request=EmptySerializer,
         responses=ResponseSerializer,
@@ -131,6 +392,7 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
         url_path="restore",
         url_name="restore",
         permission_classes=[SuperUserOnlyPermission],
+        throttle_scope="trash",
     )
     def restore(self, request, *args, **kwargs):
         if not self.allow_view_deleted:
@@ -167,6 +429,7 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
         url_path="delete-permanently",
         url_name="delete_permanently",
         permission_classes=[SuperUserOnlyPermission],
+        throttle_scope="trash",
     )
     def delete_permanently(self, request, *args, **kwargs):
         if not self.allow_view_deleted:
@@ -193,9 +456,44 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
             status=200,
         )
 
+    def restore_queryset(self, queryset: QuerySet[_ModelT]) -> None:
+        """
+        Restore the queryset, see `BaseQuerySet.restore`. Called by
+        `run_trash_job` for each batch of `restore_all`, on an instance
+        without a request.
+        """
+        queryset.restore()
+
+    def start_trash_job(self, action: str) -> Response:
+        """
+        Empties the trash or restores all of it in batches, see `run_trash_job`.
+        The actions run outside ATOMIC_REQUESTS, each batch commits on its own.
+        """
+        job = create_trash_job(
+            self.model,
+            action,
+            user_id=self.request.user.id,
+            viewset=f"{type(self).__module__}.{type(self).__qualname__}",
+        )
+        logger.info(
+            "Started %s job %s for model: %s by user: %s",
+            action,
+            job["id"],
+            self.model.__name__,
+            self.request.user.email,
+        )
+{%- if cookiecutter.use_celery == 'y' %}
+        # Enqueued once the transaction of the caller, if any, commits
+        transaction.on_commit(lambda: run_trash_job_task.delay(job["id"]))
+        return Response(TrashJobSerializer(job).data, status=202)
+{%- else %}
+        job = run_trash_job(job["id"])
+        return Response(TrashJobSerializer(job).data, status=200)
+{%- endif %}
+
     @extend_schema(
         request=EmptySerializer,
-        responses=ResponseSerializer,
+        responses=TrashJobSerializer,
     )
     @action(
         detail=False,
@@ -203,6 +501,10 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
         url_path="empty-trash",
         url_name="empty_trash",
         permission_classes=[SuperUserOnlyPermission],
+        throttle_scope="trash",
+        throttle_cost=10,
+        load_shedding_priority="low",
+        atomic_requests=False,
     )
     def empty_trash(self, request, *args, **kwargs):
         if not self.allow_view_deleted:
@@ -211,45 +513,11 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
                 "Empty Trash Not Allowed",
             )
 
-        logger.info(
-            "Emptying trash for model: %s by user: %s",
-            self.model.__name__,
-            request.user.email,
-        )
-        cache.set(
-            f"skip_log_report_activity:{request.user.id}",
-            True,
-            timeout=60,
-        )  # 60 seconds timeout
-
-        try:
-            self.model.objects.all_objects().filter(is_deleted=True).delete()
-            logger.info(
-                "Trash emptied for model: %s by user: %s",
-                self.model.__name__,
-                request.user.email,
-            )
-        finally:
-            cache.delete(f"skip_log_report_activity{request.user.id}")
-
-        return Response(
-            ResponseSerializer(
-                {
-                    "detail": "Trash emptied successfully.",
-                },
-            ).data,
-            status=200,
-        )
-
-    def restore_queryset(self, queryset: QuerySet[_ModelT]) -> None:
-        """
-        Restore the queryset by updating is_deleted and is_closed fields.
-        """
-        queryset.update(is_deleted=False)
+        return self.start_trash_job(EMPTY_TRASH)
 
     @extend_schema(
         request=EmptySerializer,
-        responses=ResponseSerializer,
+        responses=TrashJobSerializer,
     )
     @action(
         detail=False,
@@ -257,6 +525,10 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
         url_path="restore-all",
         url_name="restore_all",
         permission_classes=[SuperUserOnlyPermission],
+        throttle_scope="trash",
+        throttle_cost=10,
+        load_shedding_priority="low",
+        atomic_requests=False,
     )
     def restore_all(self, request, *args, **kwargs):
         if not self.allow_view_deleted:
@@ -265,44 +537,274 @@ class BaseModelViewSetMixin(Generic[_ModelT]):
                 "Restore All Not Allowed",
             )
 
-        queryset = self.model.objects.all_objects().filter(is_deleted=True)
-
-        if not queryset.exists():
+        if not self.model.objects.deleted().exists():
             raise BadRequest(
                 "No deleted objects to restore.",
                 "No Deleted Objects",
             )
 
-        logger.info(
-            "Restoring all deleted objects for model: %s by user: %s",
-            self.model.__name__,
-            request.user.email,
+        return self.start_trash_job(RESTORE_ALL)
+
+    @extend_schema(
+        request=EmptySerializer,
+        responses=TrashJobSerializer,
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path=r"trash-jobs/(?P<job_id>[0-9a-f]{32})",
+        url_name="trash_job",
+        permission_classes=[SuperUserOnlyPermission],
+    )
+    def trash_job(self, request, job_id=None, *args, **kwargs):
+        """
+        Status and progress of an empty trash or restore all job.
+        """
+        job = get_trash_job(job_id)
+        if job is None or job["model"] != self.model._meta.label_lower:  # noqa: SLF001
+            msg = "Trash job not found."
+            raise NotFound(msg)
+
+        return Response(TrashJobSerializer(job).data)
+
+    def get_response_cache_scope(self) -> str:
+        user = self.request.user
+        if self.response_cache_per_user:
+            return f"user_{user.pk}"
+        if user.is_superuser:
+            return "superuser"
+        return "authenticated" if user.is_authenticated else "anonymous"
+
+    def get_response_cache_key(self) -> str:
+        """
+        Key of the response for the URL, query params and user scope of the
+        request, the host included as the pagination links are absolute. It
+        includes the model generation, so the next write to the model
+        invalidates every response without scanning keys.
+        """
+        request = self.request
+        digest = hashlib.md5(
+            repr(
+                (
+                    self.action,
+                    request.build_absolute_uri(request.path),
+                    sorted(request.query_params.lists()),
+                    self.get_response_cache_scope(),
+                    request.accepted_media_type,
+                ),
+            ).encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        label = self.model._meta.label_lower  # noqa: SLF001
+        return f"response_{label}_{get_model_generation(self.model)}_{digest}"
+
+    def get_cached_response(
+        self,
+        request,
+        get_response: Callable[..., Response],
+        *args,
+        **kwargs,
+    ):
+        if self.response_cache_timeout is None or (
+            self.action == "retrieve"
+            and any(map(checks_objects, self.get_permissions()))
+        ):
+            return get_response(request, *args, **kwargs)
+
+        # The generation is read before the response is computed, a write
+        # committing meanwhile bumps it past the key
+        key = self.get_response_cache_key()
+        cached = cache.get(key)
+        if cached is not None:
+            data, headers = cached
+            return get_conditional_response(
+                request,
+                etag=headers.get("ETag"),
+                last_modified=parse_http_date_safe(headers.get("Last-Modified")),
+                response=Response(data, headers=headers),
+            )
+
+        response = get_response(request, *args, **kwargs)
+        if (
+            isinstance(response, Response)
+            and response.status_code == status.HTTP_200_OK
+        ):
+            headers = {
+                name: response[name]
+                for name in ("ETag", "Last-Modified")
+                if name in response
+            }
+            cache.set(key, (response.data, headers), self.response_cache_timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            request,
+            self.get_list_response,
+            *args,
+            **kwargs,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            request,
+            self.get_retrieve_response,
+            *args,
+            **kwargs,
+        )
+
+    def get_list_response(self, request, *args, **kwargs):
+        if not self.conditional_requests:
+            return super().list(request, *args, **kwargs)  # type: ignore[misc]
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if get_queryset_digest(queryset) is None:
+            # Matches no row whatever the data, e.g. `none()`
+            return super().list(request, *args, **kwargs)  # type: ignore[misc]
+
+        # Index only, and cached until the next write to the model
+        aggregate = get_cached_aggregate(
+            queryset,
+            last_modified=Max("updated_at"),
+            count=Count("pk"),
+        )
+        etag = self.get_etag(aggregate["last_modified"], aggregate["count"])
+
+        # No Last-Modified, removing rows changes the list without changing
+        # the latest updated_at
+        response = get_not_modified_response(request, etag, None)
+        if response is None:
+            response = super().list(request, *args, **kwargs)  # type: ignore[misc]
+            set_validators(response, etag, None)
+        return response
+
+    def get_retrieve_response(self, request, *args, **kwargs):
+        instance = self.get_object()
+
+        validated = (
+            self.conditional_requests
+            and "updated_at" not in instance.get_deferred_fields()
+        )
+        if validated:
+            etag = self.get_etag(instance.pk, instance.updated_at)
+            not_modified = get_not_modified_response(request, etag, instance.updated_at)
+            if not_modified is not None:
+                return not_modified
+
+        serializer = self.get_serializer(instance)
+        response = Response(serializer.data)
+        if validated:
+            set_validators(response, etag, instance.updated_at)
+        return response
+
+
+class BaseModelWithCreateOverWriteMixin(BaseModelViewSetMixin[_ModelT]):
+    # Most objects a bulk request may write
+    bulk_max_size = 1000
+
+    def get_bulk_serializer(self, *args, **kwargs) -> BaseListSerializer:
+        kwargs["context"] = self.get_serializer_context()
+        child = self.get_serializer_class()(
+            partial=kwargs.get("partial", False),
+            context=kwargs["context"],
+        )
+        return BaseListSerializer(
+            *args,
+            child=child,
+            max_length=self.bulk_max_size,
+            **kwargs,
         )
-        cache.set(
-            f"skip_log_report_activity:{request.user.id}",
-            True,
-            timeout=60,
-        )  # 60 seconds timeout
 
+    def get_bulk_ids(self, data) -> list:
+        """
+        Returns the distinct ids of a list payload, each item being an id or
+        an object with its `id`
+        """
+        if not isinstance(data, list) or not data:
+            msg = "Expected a non empty list."
+            raise BadRequest(msg, "Invalid Payload")
+        if len(data) > self.bulk_max_size:
+            msg = f"At most {self.bulk_max_size} objects can be written at once."
+            raise BadRequest(msg, "Too Many Objects")
+
+        to_python = self.model._meta.pk.to_python  # noqa: SLF001
         try:
-            self.restore_queryset(queryset)
-            logger.info(
-                "Restored all deleted objects for model: %s by user: %s",
-                self.model.__name__,
-                request.user.email,
-            )
-        finally:
-            cache.delete(f"skip_log_report_activity{request.user.id}")
+            ids = [
+                to_python(item["id"] if isinstance(item, dict) else item)
+                for item in data
+            ]
+        except (KeyError, TypeError, DjangoValidationError) as e:
+            msg = "Every object must have a valid id."
+            raise BadRequest(msg, "Invalid Id") from e
+
+        if len(ids) != len(set(ids)):
+            msg = "Ids must be unique within the payload."
+            raise BadRequest(msg, "Duplicate Id")
+        return ids
+
+    def get_bulk_objects(self, ids: list) -> dict:
+        """
+        The objects of the ids by pk, in the order of the ids, once their
+        object permissions are checked as `get_object` does
+        """
+        objs = self.get_queryset().in_bulk(ids)
+        missing = [str(pk) for pk in ids if pk not in objs]
+        if missing:
+            msg = f"Objects not found: {', '.join(missing)}."
+            raise NotFound(msg)
+
+        for obj in objs.values():
+            self.check_object_permissions(self.request, obj)
+        return {pk: objs[pk] for pk in ids}
 
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="bulk",
+        url_name="bulk",
+        throttle_cost=10,
+    )
+    def bulk_create(self, request, *args, **kwargs):
+        """
+        Create the objects of a list payload at once.
+        """
+        serializer = self.get_bulk_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        return Response(serializer.data, status=201)
+
+    @bulk_create.mapping.patch
+    def bulk_partial_update(self, request, *args, **kwargs):
+        """
+        Partially update the objects of a list payload, identified by their
+        `id`. Nothing is updated if an object is locked, its item gets the
+        error.
+        """
+        objs = self.get_bulk_objects(self.get_bulk_ids(request.data))
+        serializer = self.get_bulk_serializer(objs, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        return Response(serializer.data)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs):
+        """
+        Soft delete the objects of a list of ids, locked ones are left alone.
+        """
+        objs = self.get_bulk_objects(self.get_bulk_ids(request.data))
+        with transaction.atomic():
+            deleted = (
+                self.get_queryset()
+                .filter(pk__in=list(objs))
+                .soft_delete(deleted_by=request.user)
+            )
         return Response(
             ResponseSerializer(
                 {
-                    "detail": "All deleted objects restored successfully.",
+                    "detail": f"{deleted} objects deleted successfully.",
                 },
             ).data,
             status=200,
         )
-
-
-class BaseModelWithCreateOverWriteMixin(BaseModelViewSetMixin[_ModelT]):
-    pass
@@ -0,0 +1,286 @@
+import datetime
+import decimal
+import json
+import uuid
+from base64 import urlsafe_b64decode
+from base64 import urlsafe_b64encode
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError
+from django.db.models import F
+from django.db.models import Model
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor
+from rest_framework.pagination import CursorPagination
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from {{ cookiecutter.project_slug }}.base.caching import get_cached_count
+from {{ cookiecutter.project_slug }}.base.pagination import get_count
+
+
+def _encode_value(value):
+    """
+    Keeps the full precision of the values, unlike `DjangoJSONEncoder` which
+    truncates datetimes to milliseconds
+    """
+    if isinstance(value, Model):
+        return value.pk
+    if isinstance(value, datetime.date | datetime.time):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID | decimal.Decimal):
+        return str(value)
+    return value
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination over every field of the ordering, with the pk as the
+    final tie breaker. Each page is an index range scan whatever its depth,
+    with no COUNT(*) and no OFFSET. Cursors are opaque and hold the ordering
+    values of the first or last row of the page.
+
+    Follows the `OrderingFilter` of the view when it has one. NULLs of
+    nullable fields are sorted last.
+    """
+
+    ordering = ("-created_at", "-pk")
+    page_size_query_param = "limit"
+    max_page_size = 1000
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+
+        pk_names = {"pk", queryset.model._meta.pk.name}  # noqa: SLF001
+        if not any(field.lstrip("-") in pk_names for field in ordering):
+            ordering = (*ordering, "-pk" if ordering[0].startswith("-") else "pk")
+
+        return ordering
+
+    def _is_nullable(self, model, name: str) -> bool:
+        if name == "pk":
+            return False
+
+        try:
+            for part in name.split(LOOKUP_SEP):
+                field = model._meta.get_field(part)  # noqa: SLF001
+                if field.null:
+                    return True
+                model = field.related_model
+        except AttributeError, FieldDoesNotExist:
+            # Annotations and the like
+            return True
+
+        return False
+
+    def _get_order_by(self, fields, *, reverse: bool) -> list:
+        order_by = []
+        for name, descending, nullable in fields:
+            expression = F(name)
+            nulls = {}
+            if nullable:
+                nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+            if descending != reverse:
+                order_by.append(expression.desc(**nulls))
+            else:
+                order_by.append(expression.asc(**nulls))
+        return order_by
+
+    def _get_keyset_filter(self, fields, position: list, *, reverse: bool) -> Q:
+        """
+        Rows after the position in the (possibly reversed) ordering:
+        (a > x) OR (a = x AND b > y) OR ...
+        """
+        conditions = []
+        equal = Q()
+        for (name, descending, nullable), value in zip(fields, position, strict=True):
+            lookup = "lt" if descending != reverse else "gt"
+
+            if value is None:
+                # NULLs are last, only non NULLs follow them when reversed
+                after = Q(**{f"{name}__isnull": False}) if reverse else None
+                is_equal = Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__{lookup}": value})
+                if nullable and not reverse:
+                    after |= Q(**{f"{name}__isnull": True})
+                is_equal = Q(**{name: value})
+
+            if after is not None:
+                conditions.append(equal & after)
+            equal &= is_equal
+
+        return reduce(or_, conditions, Q(pk__in=[]))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        fields = [
+            (
+                field.lstrip("-"),
+                field.startswith("-"),
+                self._is_nullable(queryset.model, field.lstrip("-")),
+            )
+            for field in self.ordering
+        ]
+        queryset = queryset.order_by(*self._get_order_by(fields, reverse=reverse))
+
+        if self.cursor is not None:
+            if len(self.cursor.position) != len(fields):
+                # The ordering changed since the cursor was issued
+                raise NotFound(self.invalid_cursor_message)
+            try:
+                queryset = queryset.filter(
+                    self._get_keyset_filter(
+                        fields,
+                        self.cursor.position,
+                        reverse=reverse,
+                    ),
+                )
+            except (TypeError, ValueError, ValidationError) as e:
+                raise NotFound(self.invalid_cursor_message) from e
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_previous, self.has_next = has_more, bool(self.page)
+        else:
+            self.has_previous, self.has_next = self.cursor is not None, has_more
+
+        if self.page:
+            self.previous_position = self._get_position_from_instance(
+                self.page[0],
+                self.ordering,
+            )
+            self.next_position = self._get_position_from_instance(
+                self.page[-1],
+                self.ordering,
+            )
+        else:
+            self.has_previous = self.has_next = False
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=False, position=self.next_position),
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=self.previous_position),
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            data = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+            position = data["p"]
+            reverse = bool(data.get("r"))
+        except (TypeError, ValueError, KeyError) as e:
+            raise NotFound(self.invalid_cursor_message) from e
+
+        if not isinstance(position, list):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        data = {"p": cursor.position}
+        if cursor.reverse:
+            data["r"] = 1
+
+        encoded = urlsafe_b64encode(json.dumps(data, separators=(",", ":")).encode())
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            encoded.decode("ascii"),
+        )
+
+    def _get_position_from_instance(self, instance, ordering):
+        position = []
+        for field in ordering:
+            value = instance
+            for part in field.lstrip("-").split(LOOKUP_SEP):
+                if isinstance(value, dict):
+                    value = value.get(part)
+                else:
+                    value = getattr(value, part, None)
+                if value is None:
+                    break
+            position.append(_encode_value(value))
+        return position
+
+
+class CachedCountPagination(LimitOffsetPagination):
+    """
+    `LimitOffsetPagination` caching the exact count of each filter and search
+    combination until the next write to the model, see `get_cached_count`
+    """
+
+    def get_count(self, queryset):
+        if not hasattr(queryset, "query"):
+            return super().get_count(queryset)
+        return get_cached_count(queryset)
+
+
+class EstimatedCountPagination(LimitOffsetPagination):
+    """
+    `LimitOffsetPagination` reporting the PostgreSQL row estimate instead of
+    running COUNT(*) on large results, see `get_count`.
+    `count_is_estimated` in the response tells which one it is.
+    """
+
+    count_is_estimated = False
+
+    def get_count(self, queryset):
+        if not hasattr(queryset, "query"):
+            return super().get_count(queryset)
+
+        count, self.count_is_estimated = get_count(queryset)
+        return count
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "count_is_estimated": self.count_is_estimated,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            },
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_is_estimated"] = {
+            "type": "boolean",
+            "example": False,
+        }
+        return response_schema
@@ -1,4 +1,4 @@
-from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, BasePermission, IsAuthenticated
 
 from {{ cookiecutter.project_slug }}.users.utils import get_user_prefetch_data
 
@@ -13,3 +13,14 @@ class SuperUserOnlyPermission(IsAuthenticated):
         if not super().has_permission(request, view):
             return False
         return request.user.is_superuser
+
+
+def checks_objects(permission: BasePermission) -> bool:
+    """
+    Whether the permission overrides `has_object_permission`, composed ones
+    (`A & B`, `A | B`) always do
+    """
+    return (
+        type(permission).has_object_permission
+        is not BasePermission.has_object_permission
+    )
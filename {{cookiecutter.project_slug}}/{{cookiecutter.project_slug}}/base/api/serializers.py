@@ -1,8 +1,16 @@
 from typing import Generic, TypeVar
 
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+from rest_framework.utils import model_meta
 
+from {{ cookiecutter.project_slug }}.base.api.fieldsets import get_sparse_fieldset
 from {{ cookiecutter.project_slug }}.base.api.request import BaseRequest
+from {{ cookiecutter.project_slug }}.base.api.validators import (
+    UniqueFieldIncludingDeletedValidator,
+    UniqueFieldValidator,
+)
 from {{ cookiecutter.project_slug }}.base.models import BaseModel
 from {{ cookiecutter.project_slug }}.users.models import User
 
@@ -12,7 +20,7 @@ _ModelT = TypeVar("_ModelT", bound=BaseModel)
 class MinimalUserDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ("id", "name", "email", "color")
+        fields = ("id", "name", "email")
 
 
 class EmptySerializer(serializers.Serializer):
@@ -34,6 +42,162 @@ class ResponseSerializer(serializers.Serializer):
     detail = serializers.CharField()
 
 
+class TrashJobSerializer(serializers.Serializer):
+    id = serializers.CharField()
+    action = serializers.CharField()
+    status = serializers.CharField()
+    total = serializers.IntegerField()
+    processed = serializers.IntegerField()
+    affected = serializers.IntegerField()
+    error = serializers.CharField(allow_null=True)
+
+
+class BaseListSerializer(serializers.ListSerializer):
+    """
+    Writes a list payload with a single `bulk_create` or `bulk_update`,
+    without `save()` nor its signals.
+
+    To update, `instance` is a dict of the objects by pk in the order of the
+    payload, whose items each carry the `id` of their object. Locked objects
+    fail the validation of their item.
+
+    The unique fields are checked against the database for all the items at
+    once, instead of by the validators of the child.
+    """
+
+    def to_internal_value(self, data):
+        self.unique_fields = self._pop_unique_validators()
+        attrs = super().to_internal_value(data)
+
+        pks = [None] * len(attrs) if self.instance is None else list(self.instance)
+        errors = {}
+        for name, including_deleted in self.unique_fields.items():
+            source = self.child.fields[name].source
+            indexes = [index for index, item in enumerate(attrs) if source in item]
+            messages = self.child.Meta.model.get_unique_errors(
+                source,
+                [(attrs[index][source], pks[index]) for index in indexes],
+                including_deleted=including_deleted,
+            )
+            for index, message in zip(indexes, messages, strict=True):
+                if message is not None:
+                    errors.setdefault(index, {})[name] = [message]
+
+        if errors:
+            # In the format of the errors of the items, a list before DRF 3.18
+            if not getattr(api_settings, "LIST_SERIALIZER_ERRORS_AS_DICT", False):
+                errors = [errors.get(index, {}) for index in range(len(attrs))]
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def _pop_unique_validators(self) -> dict[str, bool]:
+        """
+        Removes the unique validators of the fields of the child, returns the
+        fields they validated and whether deleted objects count
+        """
+        unique_fields = {}
+        for name, field in self.child.fields.items():
+            unique = [
+                validator
+                for validator in field.validators
+                if isinstance(
+                    validator,
+                    UniqueFieldValidator | UniqueFieldIncludingDeletedValidator,
+                )
+            ]
+            if not unique:
+                continue
+
+            field.validators = [
+                validator for validator in field.validators if validator not in unique
+            ]
+            unique_fields[name] = any(
+                isinstance(validator, UniqueFieldIncludingDeletedValidator)
+                for validator in unique
+            )
+        return unique_fields
+
+    def run_child_validation(self, data):
+        if self.instance is None:
+            return super().run_child_validation(data)
+
+        if not isinstance(data, dict):
+            message = self.child.error_messages["invalid"].format(
+                datatype=type(data).__name__,
+            )
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [message]},
+                code="invalid",
+            )
+
+        pk = self.child.Meta.model._meta.pk.to_python(data["id"])  # noqa: SLF001
+        if self.instance[pk].locked:
+            raise serializers.ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: ["Cannot update a locked object."]},
+                code="locked",
+            )
+
+        self.child.instance = self.instance[pk]
+        self.child.initial_data = data
+        return super().run_child_validation(data)
+
+    def validate(self, attrs):
+        """
+        The unique fields must also be unique within the payload
+        """
+        for name in self.unique_fields:
+            field = self.child.fields[name]
+            values = [item[field.source] for item in attrs if field.source in item]
+            if len(values) != len(set(values)):
+                raise serializers.ValidationError(
+                    {name: "Values must be unique within the payload."},
+                )
+        return attrs
+
+    def _pop_many_to_many(self, attrs: dict) -> dict:
+        info = model_meta.get_field_info(self.child.Meta.model)
+        return {
+            name: attrs.pop(name)
+            for name, relation in info.relations.items()
+            if relation.to_many and name in attrs
+        }
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        many_to_many = [self._pop_many_to_many(attrs) for attrs in validated_data]
+
+        objs = model.objects.bulk_create([model(**attrs) for attrs in validated_data])
+
+        for obj, relations in zip(objs, many_to_many, strict=True):
+            for name, value in relations.items():
+                getattr(obj, name).set(value)
+        return objs
+
+    def update(self, instance, validated_data):
+        model = self.child.Meta.model
+        objs = list(instance.values())
+        fields = {"updated_at"}
+        datetime_now = timezone.now()
+
+        for obj, attrs in zip(objs, validated_data, strict=True):
+            relations = self._pop_many_to_many(attrs)
+            for name, value in attrs.items():
+                setattr(obj, name, value)
+            obj.updated_at = datetime_now
+            fields.update(attrs)
+
+            for name, value in relations.items():
+                getattr(obj, name).set(value)
+
+        model.objects.all_objects().bulk_update(objs, sorted(fields))
+        return objs
+
+    def save(self, **kwargs):
+        return super().save(
+            **{**kwargs, **self.child.get_manipulation_data(all=self.instance is None)},
+        )
+
+
 class BaseModelSerializer(serializers.ModelSerializer):
     created_by = MinimalUserDetailSerializer(read_only=True)
     updated_by = MinimalUserDetailSerializer(read_only=True)
@@ -65,6 +229,38 @@ class BaseModelSerializer(serializers.ModelSerializer):
     def request(self) -> BaseRequest | None:
         return self.context.get("request")
 
+    def get_fields(self):
+        """
+        Applies the `?fields=` and `?expand=` of the request to the top level
+        serializer, see `get_sparse_fieldset`
+        """
+        fields = super().get_fields()
+
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        if parent is not None:
+            return fields
+
+        requested, expand = get_sparse_fieldset(self.request)
+        if requested is not None:
+            fields = {
+                name: field for name, field in fields.items() if name in requested
+            }
+        if expand is not None:
+            for name, field in fields.items():
+                if name not in expand and isinstance(
+                    field,
+                    serializers.BaseSerializer | RecursiveField,
+                ):
+                    fields[name] = serializers.PrimaryKeyRelatedField(
+                        read_only=True,
+                        source=field.source,
+                        many=isinstance(field, serializers.ListSerializer)
+                        or getattr(field, "many", False),
+                    )
+        return fields
+
     def get_manipulation_data(self, *, all=False) -> dict:
         """
         Returns a dictionary with manipulation data based on the request context.
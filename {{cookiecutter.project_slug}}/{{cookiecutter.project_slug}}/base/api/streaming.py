@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from django.db.models import QuerySet
+
+
+def iterate_in_chunks(queryset: QuerySet, chunk_size: int) -> Iterator[list]:
+    """
+    Reads a queryset with a server-side cursor, `chunk_size` rows at a time.
+    Prefetches are done per chunk.
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def serialize_in_chunks(
+    queryset: QuerySet,
+    get_serializer: Callable,
+    chunk_size: int,
+) -> Iterator[dict]:
+    """
+    Serializes a queryset one chunk at a time, so memory stays constant
+    whatever the number of rows
+    """
+    for chunk in iterate_in_chunks(queryset, chunk_size):
+        yield from get_serializer(chunk, many=True).data
+
+
+def stream_json_array(rows: Iterable[dict]) -> Iterator[str]:
+    yield "["
+    for index, row in enumerate(rows):
+        yield ("," if index else "") + json.dumps(row, cls=JSONEncoder)
+    yield "]"
+
+
+def stream_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, cls=JSONEncoder) + "\n"
+
+
+class _Echo:
+    """
+    File-like object handing back what `csv.writer` writes to it
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _encode_csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, dict | list):
+        return json.dumps(value, cls=JSONEncoder)
+    if isinstance(value, datetime.date | datetime.time):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(rows: Iterable[dict], fieldnames: Iterable[str]) -> Iterator[str]:
+    """
+    Streams the rows as CSV with a header, nested values are JSON encoded
+    """
+    fieldnames = list(fieldnames)
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fieldnames)
+    for row in rows:
+        yield writer.writerow([_encode_csv_value(row.get(name)) for name in fieldnames])
+
+
+class _StreamingRenderer(BaseRenderer):
+    """
+    Lets content negotiation pick the format of a streamed response, which
+    renders its own content. Errors, raised before streaming, are rendered as
+    JSON with a JSON content type.
+    """
+
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        response = (renderer_context or {}).get("response")
+        if response is not None:
+            response["Content-Type"] = "application/json"
+        return json.dumps(data, cls=JSONEncoder).encode()
+
+
+class CSVRenderer(_StreamingRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class NDJSONRenderer(_StreamingRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
@@ -1,4 +1,5 @@
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
+from rest_framework_simplejwt.views import TokenObtainPairView
 
 from {{ cookiecutter.project_slug }}.base.api.mixins import (
     BaseModelViewSetMixin,
@@ -12,3 +13,8 @@ class BaseModelViewSet(BaseModelWithCreateOverWriteMixin, ModelViewSet):
 
 class BaseModelReadOnlyViewSet(BaseModelViewSetMixin, ReadOnlyModelViewSet):
     pass
+
+
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    throttle_scope = "token_obtain"
+    load_shedding_priority = "high"
@@ -6,3 +6,6 @@ class BaseConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "{{ cookiecutter.project_slug }}.base"
     verbose_name = _("Base Application")
+
+    def ready(self):
+        from {{ cookiecutter.project_slug }}.base import checks  # noqa: F401, PLC0415
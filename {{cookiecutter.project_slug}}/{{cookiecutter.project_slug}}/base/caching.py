@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.db import transaction
+
+if TYPE_CHECKING:
+    from django.db.models import QuerySet
+
+
+def _get_generation_key(model) -> str:
+    return f"model_generation_{model._meta.concrete_model._meta.label_lower}"  # noqa: SLF001
+
+
+def get_model_generation(model) -> int:
+    """
+    Returns the generation of a model, bumped on every write to its table.
+    Cache keys including it are invalidated by the next write.
+    """
+    return cache.get(_get_generation_key(model), 0)
+
+
+def bump_model_generation(model, using=None):
+    """
+    Bumps the generation of a model once the current transaction commits, so
+    readers cannot cache data of the old generation under the new one
+    """
+    key = _get_generation_key(model)
+
+    def bump():
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+    transaction.on_commit(bump, using=using)
+
+
+def get_queryset_digest(queryset: QuerySet) -> str | None:
+    """
+    Hash of the SQL of a queryset without its ordering, the same for every
+    request filtering the same way whatever the order of the parameters.
+    None when the queryset cannot match any row, e.g. `none()` or `pk__in=[]`.
+    """
+    try:
+        sql, params = queryset.order_by().query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    return hashlib.md5(repr((sql, params)).encode(), usedforsecurity=False).hexdigest()
+
+
+def get_cached_count(queryset: QuerySet, timeout: int | None = None) -> int:
+    """
+    Exact count of a queryset, cached until the next write to its model
+    """
+    if timeout is None:
+        timeout = getattr(settings, "COUNT_CACHE_TIMEOUT", 300)
+
+    digest = get_queryset_digest(queryset)
+    if digest is None:
+        return 0
+
+    model = queryset.model
+    key = f"count_{model._meta.label_lower}_{get_model_generation(model)}_{digest}"  # noqa: SLF001
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+def get_cached_aggregate(
+    queryset: QuerySet,
+    timeout: int | None = None,
+    **aggregates,
+) -> dict:
+    """
+    `queryset.aggregate(**aggregates)`, cached until the next write to its model
+    """
+    if timeout is None:
+        timeout = getattr(settings, "COUNT_CACHE_TIMEOUT", 300)
+
+    queryset_digest = get_queryset_digest(queryset)
+    if queryset_digest is None:
+        # Answered without a query, nothing to cache
+        return queryset.order_by().aggregate(**aggregates)
+
+    model = queryset.model
+    digest = hashlib.md5(
+        repr((queryset_digest, sorted(aggregates.items()))).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    key = f"aggregate_{model._meta.label_lower}_{get_model_generation(model)}_{digest}"  # noqa: SLF001
+    result = cache.get(key)
+    if result is None:
+        result = queryset.order_by().aggregate(**aggregates)
+        cache.set(key, result, timeout)
+    return result
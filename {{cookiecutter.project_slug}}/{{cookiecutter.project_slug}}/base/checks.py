@@ -0,0 +1,49 @@
+from django.apps import apps
+from django.core import checks
+from django.db.migrations.loader import MigrationLoader
+
+from {{ cookiecutter.project_slug }}.base.models import BaseModel
+from {{ cookiecutter.project_slug }}.base.models import get_soft_delete_indexes
+
+
+@checks.register(checks.Tags.models)
+def check_soft_delete_indexes(app_configs=None, **kwargs):
+    """
+    Warns about the `BaseModel` soft delete indexes missing from migrations
+    """
+    models = [
+        model
+        for model in apps.get_models()
+        if issubclass(model, BaseModel)
+        and model.soft_delete_indexes
+        and (app_configs is None or model._meta.app_config in app_configs)  # noqa: SLF001
+    ]
+    if not models:
+        return []
+
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    state = loader.project_state()
+
+    errors = []
+    for model in models:
+        model_state = state.models.get((model._meta.app_label, model._meta.model_name))  # noqa: SLF001
+        if model_state is None:
+            continue
+
+        migrated = {index.name for index in model_state.options.get("indexes", [])}
+        expected = {index.name for index in model._meta.indexes}  # noqa: SLF001
+        missing = [
+            index.name
+            for index in get_soft_delete_indexes(model)
+            if index.name in expected and index.name not in migrated
+        ]
+        if missing:
+            errors.append(
+                checks.Warning(
+                    f"Soft delete indexes {', '.join(missing)} have no migration.",
+                    hint=f"Run `manage.py makemigrations {model._meta.app_label}`.",  # noqa: SLF001
+                    obj=model,
+                    id="base.W001",
+                ),
+            )
+    return errors
@@ -0,0 +1,93 @@
+import math
+import threading
+import time
+
+LOAD_SHEDDING_PRIORITIES = {
+    "low": 0,
+    "normal": 1,
+    "high": 2,
+    "critical": 3,
+}
+
+DEFAULT_PRIORITY = "normal"
+
+
+def get_view_priority(view_func) -> int:
+    """
+    Returns the priority a view declares with `load_shedding_priority`.
+
+    DRF views are looked up on their class, and the `@action` kwargs or
+    `as_view` initkwargs take precedence so actions can declare their own.
+    """
+    initkwargs = getattr(view_func, "initkwargs", {})
+    view_class = getattr(view_func, "cls", view_func)
+    priority = initkwargs.get(
+        "load_shedding_priority",
+        getattr(view_class, "load_shedding_priority", DEFAULT_PRIORITY),
+    )
+    return LOAD_SHEDDING_PRIORITIES[priority]
+
+
+class AdmissionController:
+    """
+    Per process admission control modeled after CoDel.
+
+    Every request arriving is a sample of the queueing delay: the time since
+    the proxy or the gunicorn worker received it (`X-Request-Start`), or
+    whether it took the last free worker thread when the header is missing.
+    A worker never runs more requests than it has threads, so the requests
+    queued behind the last one are not seen until a thread frees. When even the
+    smallest delay of an `interval` is above `target` there is a standing
+    queue, and each consecutive overloaded interval sheds one more priority
+    level, starting with "low". "high" and "critical" are never shed.
+    """
+
+    def __init__(self, target=0.05, interval=0.5, max_in_flight=4):
+        self.target = target
+        self.interval = interval
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self.overloaded_intervals = 0
+        self._lock = threading.Lock()
+        self._interval_start = self._last_arrival = time.monotonic()
+        self._min_delay = math.inf
+
+    def _next_interval(self, now: float):
+        if now - self._interval_start < self.interval:
+            return
+
+        if now - self._last_arrival >= self.interval:
+            # Idle for a whole interval, there is no queue
+            self.overloaded_intervals = 0
+        elif self._min_delay > self.target:
+            self.overloaded_intervals += 1
+        else:
+            self.overloaded_intervals = 0
+
+        self._interval_start = now
+        self._min_delay = math.inf
+
+    def begin(self, queue_delay: float | None = None):
+        """
+        Register a request arriving with its queueing delay, if known
+        """
+        with self._lock:
+            if queue_delay is None:
+                # Queued when the requests in flight now hold every thread
+                queue_delay = (
+                    math.inf if self.in_flight + 1 >= self.max_in_flight else 0
+                )
+            self.in_flight += 1
+
+            now = time.monotonic()
+            self._next_interval(now)
+            self._min_delay = min(self._min_delay, queue_delay)
+            self._last_arrival = now
+
+    def end(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def should_shed(self, priority: int) -> bool:
+        shed_below = min(self.overloaded_intervals, LOAD_SHEDDING_PRIORITIES["high"])
+        return priority < shed_below
@@ -1,7 +1,69 @@
 from django.db import models
+from django.utils import timezone
 
+from {{ cookiecutter.project_slug }}.base.caching import bump_model_generation
 
-class BaseManager(models.Manager):
+
+class BaseQuerySet(models.QuerySet):
+    """
+    Set-based counterparts of `BaseModel.delete`, `restore` and `hard_delete`.
+    Each runs as a single UPDATE or DELETE, without loading the rows. Locked
+    rows are never deleted, but they are restored.
+
+    Bulk writes bump the model generation, see `bump_model_generation`.
+    `bulk_update` bumps it through `update`.
+    """
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        bump_model_generation(self.model, using=self.db)
+        return rows
+
+    def delete(self):
+        deleted = super().delete()
+        bump_model_generation(self.model, using=self.db)
+        return deleted
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        bump_model_generation(self.model, using=self.db)
+        return objs
+
+    def soft_delete(self, deleted_by=None) -> int:
+        """
+        Soft delete the unlocked rows, returns how many were deleted
+        """
+        datetime_now = timezone.now()
+        return self.filter(is_deleted=False, locked=False).update(
+            is_deleted=True,
+            deleted_at=datetime_now,
+            deleted_by=deleted_by,
+            updated_at=datetime_now,
+        )
+
+    def restore(self) -> int:
+        """
+        Restore the deleted rows, returns how many were restored
+        """
+        return self.filter(is_deleted=True).update(
+            is_deleted=False,
+            deleted_at=None,
+            deleted_by=None,
+            updated_at=timezone.now(),
+        )
+
+    def hard_delete(self) -> tuple[int, dict[str, int]]:
+        """
+        Permanently delete the unlocked rows.
+
+        Runs a single DELETE unless related objects have to be cascaded or
+        delete signals have receivers, in which case Django's collector has
+        to load the rows first.
+        """
+        return self.filter(locked=False).delete()
+
+
+class BaseManager(models.Manager.from_queryset(BaseQuerySet)):
     def get_queryset(self):
         return super().get_queryset().filter(is_deleted=False)
 
@@ -1,8 +1,25 @@
+import math
+import re
+import time
+
 from django.conf import settings
 from django.shortcuts import redirect
+from django.urls import Resolver404
+from django.urls import resolve
+from rest_framework import status
 from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
+from {{ cookiecutter.project_slug }}.base.api.exception_handler import get_throttled_detail
+from {{ cookiecutter.project_slug }}.base.load_shedding import AdmissionController
+from {{ cookiecutter.project_slug }}.base.load_shedding import get_view_priority
+from {{ cookiecutter.project_slug }}.base.throttling import AnonymousRequestThrottles
+from {{ cookiecutter.project_slug }}.base.throttling import release_concurrency_slots
+from {{ cookiecutter.project_slug }}.base.throttling import release_concurrency_slots_with
+
+# X-Request-Start values above it are in milliseconds or microseconds
+MAX_REQUEST_START_SECONDS = 1e11
+
 
 class MiddlewareResponseRendererMixin:
     def _get_response(self, response: Response):
@@ -11,3 +28,152 @@ class MiddlewareResponseRendererMixin:
         response.renderer_context = {}
         response.render()
         return response
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    Releases the in-flight request slots taken by `ConcurrentRequestThrottles`
+    that the view did not release, as when it raised an exception, instead of
+    holding them until they expire.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        except Exception:
+            release_concurrency_slots(request)
+            raise
+
+        release_concurrency_slots_with(response, request)
+        return response
+
+
+class ThrottleMiddleware(MiddlewareResponseRendererMixin):
+    """
+    Throttles anonymous requests to `THROTTLE_MIDDLEWARE_URLS_REGEX` before the
+    session, authentication and the `ATOMIC_REQUESTS` transaction, so rejected
+    requests never touch the database. Should be the first middleware.
+
+    Requests carrying credentials to a view that authenticates them are only
+    rejected if their ident is already denied locally, the view throttles
+    count them once they are authenticated. Views without authentication, like
+    the token ones, always count them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.scope = getattr(settings, "THROTTLE_MIDDLEWARE_SCOPE", "token_obtain")
+        self.urls_regex = re.compile(
+            getattr(settings, "THROTTLE_MIDDLEWARE_URLS_REGEX", r"^/api/token/$"),
+        )
+
+    def _has_credentials(self, request) -> bool:
+        return (
+            "HTTP_AUTHORIZATION" in request.META
+            or settings.SESSION_COOKIE_NAME in request.COOKIES
+        )
+
+    def _authenticates(self, request) -> bool:
+        """
+        Whether the view of the request authenticates its credentials
+        """
+        try:
+            match = resolve(request.path_info, getattr(request, "urlconf", None))
+        except Resolver404:
+            return False
+
+        view_class = getattr(match.func, "cls", None)
+        initkwargs = getattr(match.func, "initkwargs", {})
+        return bool(
+            initkwargs.get(
+                "authentication_classes",
+                getattr(view_class, "authentication_classes", ()),
+            ),
+        )
+
+    def __call__(self, request):
+        if not self.urls_regex.match(request.path_info):
+            return self.get_response(request)
+
+        throttle = AnonymousRequestThrottles()
+        throttle.scope = self.scope
+        ident = throttle.get_ident(request)
+
+        if self._has_credentials(request) and self._authenticates(request):
+            allowed = not throttle.is_denied(ident)
+        else:
+            allowed = throttle.evaluate(ident)
+            request.evaluated_throttle_scopes = {self.scope}
+
+        if not allowed:
+            wait = throttle.wait()
+            return self._get_response(
+                Response(
+                    {"detail": get_throttled_detail(wait)},
+                    status=status.HTTP_429_TOO_MANY_REQUESTS,
+                    headers={"Retry-After": str(math.ceil(wait))},
+                ),
+            )
+
+        return self.get_response(request)
+
+
+class LoadSheddingMiddleware(MiddlewareResponseRendererMixin):
+    """
+    Rejects low priority requests with a 503 while the worker is overloaded,
+    see `AdmissionController`. Views declare their `load_shedding_priority`
+    ("low", "normal", "high" or "critical").
+
+    Should come right after `ThrottleMiddleware`. Requests are rejected in
+    `process_view`, before the view and its database transaction.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.controller = AdmissionController(
+            target=getattr(settings, "LOAD_SHEDDING_TARGET", 0.05),
+            interval=getattr(settings, "LOAD_SHEDDING_INTERVAL", 0.5),
+            max_in_flight=getattr(settings, "LOAD_SHEDDING_MAX_IN_FLIGHT", 4),
+        )
+
+    def _get_queue_delay(self, request) -> float | None:
+        """
+        Time since the proxy received the request, from `X-Request-Start`
+        in seconds, milliseconds or microseconds (e.g. "t=1700000000.123")
+        """
+        header = request.META.get("HTTP_X_REQUEST_START")
+        if not header:
+            return None
+
+        try:
+            request_start = float(header.removeprefix("t="))
+        except ValueError:
+            return None
+
+        while request_start > MAX_REQUEST_START_SECONDS:
+            request_start /= 1000
+
+        return max(time.time() - request_start, 0)
+
+    def __call__(self, request):
+        self.controller.begin(self._get_queue_delay(request))
+        try:
+            return self.get_response(request)
+        finally:
+            self.controller.end()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.controller.should_shed(get_view_priority(view_func)):
+            return None
+
+        retry_after = math.ceil(self.controller.interval * 2)
+        return self._get_response(
+            Response(
+                {"detail": "Server is busy. Please try again later."},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(retry_after)},
+            ),
+        )
@@ -1,8 +1,13 @@
+from collections import defaultdict
+
 from django.conf import settings
 from django.core.cache import cache
 from django.db import models
+from django.db.backends.utils import names_digest
+from django.db.models.signals import class_prepared
 from django.utils import timezone
 
+from {{ cookiecutter.project_slug }}.base.caching import bump_model_generation
 from {{ cookiecutter.project_slug }}.base.managers import BaseManager
 from {{ cookiecutter.project_slug }}.base.exceptions import BadRequest
 
@@ -43,6 +48,9 @@ class BaseModel(models.Model):
 
     objects = BaseManager()
 
+    # Add the partial indexes of `get_soft_delete_indexes`
+    soft_delete_indexes = True
+
     class Meta:
         abstract = True
         ordering = ["-created_at"]
@@ -50,10 +58,11 @@ class BaseModel(models.Model):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         # Adding these in case of direct object creation. For e.g. bulk_create
+        # Deferred fields are not in __dict__, reading them would refetch them
         datetime_now = timezone.now()
-        if not self.created_at:
+        if "created_at" in self.__dict__ and not self.created_at:
             self.created_at = datetime_now
-        if not self.updated_at:
+        if "updated_at" in self.__dict__ and not self.updated_at:
             self.updated_at = datetime_now
 
     def _add_to_update_fields(self, update_fields, field_name):
@@ -84,7 +93,8 @@ class BaseModel(models.Model):
             )
 
         # ruff: noqa: DJ012
-        return super().save(*args, **kwargs)
+        super().save(*args, **kwargs)
+        bump_model_generation(type(self), using=kwargs.get("using"))
 
     def restore(self, *args, **kwargs):
         self.is_deleted = False
@@ -111,7 +121,9 @@ class BaseModel(models.Model):
         )
 
     def hard_delete(self, *args, **kwargs):
-        super().delete(*args, **kwargs)
+        deleted = super().delete(*args, **kwargs)
+        bump_model_generation(type(self), using=kwargs.get("using"))
+        return deleted
 
     @classmethod
     def get_validation_sql_logic(
@@ -164,3 +176,103 @@ class BaseModel(models.Model):
         if cls.objects.all_objects().filter(sql_logic).exists():
             msg = f"{field_value} already exists in trash. Please restore and use it."
             raise BadRequest(msg)
+
+    @classmethod
+    def get_unique_errors(
+        cls,
+        field_name,
+        items,
+        *,
+        including_deleted=False,
+    ):
+        """
+        `validate_field_as_unique`, or its `_including_deleted` variant, of
+        many `(field_value, pk)` items in a single query. Returns the error
+        message of each item, None when its value is unique.
+        """
+        values = {field_value for field_value, _ in items}
+        queryset = cls.objects.all_objects() if including_deleted else cls.objects
+        taken = defaultdict(list)
+        for field_value, pk, is_deleted in queryset.filter(
+            **{f"{field_name}__in": values},
+        ).values_list(field_name, "pk", "is_deleted"):
+            taken[field_value].append((pk, is_deleted))
+
+        errors = []
+        for field_value, pk in items:
+            deleted = [
+                is_deleted
+                for other_pk, is_deleted in taken[field_value]
+                if not pk or other_pk != pk
+            ]
+            if not deleted:
+                errors.append(None)
+            elif not all(deleted):
+                errors.append(f"{field_value} already exists.")
+            else:
+                errors.append(
+                    f"{field_value} already exists in trash. "
+                    "Please restore and use it.",
+                )
+        return errors
+
+
+def get_soft_delete_indexes(model) -> list[models.Index]:
+    """
+    Partial indexes matching the default access paths of a `BaseModel`: the
+    live rows in `Meta.ordering` order, the (usually few) trashed ones and the
+    latest update of the live rows for conditional GETs.
+    Names are derived from the table so they stay stable across migrations.
+    """
+    table = model._meta.db_table  # noqa: SLF001
+    ordering = ["-created_at", f"-{model._meta.pk.name}"]  # noqa: SLF001
+    return [
+        models.Index(
+            fields=ordering,
+            condition=models.Q(is_deleted=False),
+            name=f"{table[:16]}_{names_digest(table, 'live', length=8)}_live",
+        ),
+        models.Index(
+            fields=ordering,
+            condition=models.Q(is_deleted=True),
+            name=f"{table[:16]}_{names_digest(table, 'del', length=8)}_del",
+        ),
+        models.Index(
+            fields=["-updated_at"],
+            condition=models.Q(is_deleted=False),
+            name=f"{table[:16]}_{names_digest(table, 'upd', length=8)}_upd",
+        ),
+    ]
+
+
+def add_soft_delete_indexes(sender, **kwargs):
+    """
+    Adds the soft delete indexes to the concrete `BaseModel` subclasses, so
+    `makemigrations` picks them up. Set `soft_delete_indexes = False` on a
+    model to opt out.
+    """
+    if not issubclass(sender, BaseModel) or not sender.soft_delete_indexes:
+        return
+
+    opts = sender._meta  # noqa: SLF001
+    if opts.abstract or opts.proxy or not opts.managed or opts.swapped:
+        return
+
+    # Inherited from a concrete parent, whose table holds the columns
+    if opts.get_field("is_deleted").model is not sender:
+        return
+
+    names = {index.name for index in opts.indexes}
+    opts.indexes = [
+        *opts.indexes,
+        *(
+            index
+            for index in get_soft_delete_indexes(sender)
+            if index.name not in names
+        ),
+    ]
+    # Migrations only look at the options declared in Meta
+    opts.original_attrs["indexes"] = opts.indexes
+
+
+class_prepared.connect(add_soft_delete_indexes)
@@ -0,0 +1,82 @@
+import json
+import logging
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import DatabaseError
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+from {{ cookiecutter.project_slug }}.base.caching import get_cached_count
+
+logger = logging.getLogger(__name__)
+
+
+def get_estimated_count(queryset: QuerySet) -> int | None:
+    """
+    Returns the row estimate of PostgreSQL for a queryset: `pg_class.reltuples`
+    for a whole table, the planner's estimate of the query otherwise. Returns
+    `None` when there is no estimate (other databases, never analyzed tables).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    try:
+        if not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                    [connection.ops.quote_name(queryset.model._meta.db_table)],  # noqa: SLF001
+                )
+                row = cursor.fetchone()
+            estimate = row[0] if row else -1
+        else:
+            plan = json.loads(queryset.order_by().explain(format="json"))
+            # Django unwraps the single element list PostgreSQL returns
+            if isinstance(plan, list):
+                plan = plan[0]
+            estimate = plan["Plan"]["Plan Rows"]
+    except DatabaseError, ValueError, KeyError, IndexError:
+        logger.warning(
+            "Could not estimate the count of %s",
+            queryset.model,
+            exc_info=True,
+        )
+        return None
+
+    # -1 until the table is vacuumed or analyzed
+    return int(estimate) if estimate >= 0 else None
+
+
+def get_count(queryset: QuerySet, threshold: int | None = None) -> tuple[int, bool]:
+    """
+    Returns the count of a queryset and whether it is estimated. The estimate
+    is used when it is over `threshold` (`ESTIMATED_COUNT_THRESHOLD` setting),
+    the exact count, cached until the next write to the model, otherwise.
+    """
+    if threshold is None:
+        threshold = getattr(settings, "ESTIMATED_COUNT_THRESHOLD", 10_000)
+
+    estimate = get_estimated_count(queryset)
+    if estimate is not None and estimate > threshold:
+        return estimate, True
+
+    return get_cached_count(queryset), False
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for the admin changelists of large tables, see `get_count`
+    """
+
+    count_is_estimated = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+
+        count, self.count_is_estimated = get_count(self.object_list)
+        return count
@@ -0,0 +1,10 @@
+from celery import shared_task
+
+from .trash import run_trash_job
+
+
+@shared_task()
+def run_trash_job_task(job_id):
+    """Empties or restores all of the trash in the background, see `run_trash_job`."""
+    job = run_trash_job(job_id)
+    return job and job["status"]
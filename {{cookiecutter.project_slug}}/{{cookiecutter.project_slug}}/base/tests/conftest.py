@@ -0,0 +1,15 @@
+import pytest
+from django.core.cache import cache
+
+# Registers the test models before the test database is created
+from {{ cookiecutter.project_slug }}.base.tests import models  # noqa: F401
+
+
+@pytest.fixture(autouse=True)
+def _locmem_cache(settings):
+    # Model generations and cached counts live in the cache
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    }
+    yield
+    cache.clear()
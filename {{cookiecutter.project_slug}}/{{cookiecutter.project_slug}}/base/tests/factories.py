@@ -0,0 +1,21 @@
+from factory import Faker
+from factory import SubFactory
+from factory.django import DjangoModelFactory
+
+from {{ cookiecutter.project_slug }}.base.tests.models import Author
+from {{ cookiecutter.project_slug }}.base.tests.models import Book
+
+
+class AuthorFactory(DjangoModelFactory[Author]):
+    name = Faker("name")
+
+    class Meta:
+        model = Author
+
+
+class BookFactory(DjangoModelFactory[Book]):
+    title = Faker("sentence", nb_words=3)
+    author = SubFactory(AuthorFactory)
+
+    class Meta:
+        model = Book
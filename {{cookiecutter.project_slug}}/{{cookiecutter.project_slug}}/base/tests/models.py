@@ -0,0 +1,22 @@
+"""
+Concrete `BaseModel` subclasses for the tests of the base app. The app has no
+migrations, so their tables are created with the test database.
+"""
+
+from django.db import models
+
+from {{ cookiecutter.project_slug }}.base.models import BaseModel
+
+
+class Author(BaseModel):
+    name = models.CharField(max_length=100)
+
+
+class Book(BaseModel):
+    title = models.CharField(max_length=100)
+    author = models.ForeignKey(Author, on_delete=models.CASCADE)
+
+
+class AuthorProfile(BaseModel):
+    author = models.OneToOneField(Author, on_delete=models.CASCADE)
+    bio = models.TextField(blank=True)
@@ -0,0 +1,280 @@
+import pytest
+from django.db import connection
+from django.db import transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.permissions import BasePermission
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from {{ cookiecutter.project_slug }}.base.api.validators import UniqueFieldIncludingDeletedValidator
+from {{ cookiecutter.project_slug }}.base.api.validators import UniqueFieldValidator
+from {{ cookiecutter.project_slug }}.base.tests.factories import AuthorFactory
+from {{ cookiecutter.project_slug }}.base.tests.factories import BookFactory
+from {{ cookiecutter.project_slug }}.base.tests.models import Book
+from {{ cookiecutter.project_slug }}.base.tests.views import BookSerializer
+from {{ cookiecutter.project_slug }}.base.tests.views import BookViewSet
+
+pytestmark = pytest.mark.django_db
+
+ACTIONS = {
+    "post": "bulk_create",
+    "patch": "bulk_partial_update",
+    "delete": "bulk_destroy",
+}
+
+
+class NotLockedPermission(BasePermission):
+    def has_object_permission(self, request, view, obj):
+        return not obj.locked
+
+
+class LockedForbiddenBookViewSet(BookViewSet):
+    permission_classes = [*BookViewSet.permission_classes, NotLockedPermission]
+
+
+class UniqueTitleBookSerializer(BookSerializer):
+    class Meta(BookSerializer.Meta):
+        extra_kwargs = {
+            **BookSerializer.Meta.extra_kwargs,
+            "title": {"validators": [UniqueFieldValidator(Book, "title")]},
+        }
+
+
+class UniqueTitleBookViewSet(BookViewSet):
+    serializer_class = UniqueTitleBookSerializer
+
+
+class UniqueTitleIncludingDeletedBookSerializer(BookSerializer):
+    class Meta(BookSerializer.Meta):
+        extra_kwargs = {
+            **BookSerializer.Meta.extra_kwargs,
+            "title": {
+                "validators": [UniqueFieldIncludingDeletedValidator(Book, "title")],
+            },
+        }
+
+
+class UniqueTitleIncludingDeletedBookViewSet(BookViewSet):
+    serializer_class = UniqueTitleIncludingDeletedBookSerializer
+
+
+def bulk(user, method, data, viewset=BookViewSet):
+    request = getattr(APIRequestFactory(), method)("/books/bulk/", data, format="json")
+    force_authenticate(request, user)
+    # As ATOMIC_REQUESTS does, errors roll the request back
+    with transaction.atomic():
+        return viewset.as_view(ACTIONS)(request)
+
+
+def get_item_errors(response) -> dict:
+    """
+    The errors of the items by index, whether DRF lists or maps them
+    """
+    if isinstance(response.data, dict):
+        return dict(response.data)
+    return {index: errors for index, errors in enumerate(response.data) if errors}
+
+
+def test_bulk_create(user):
+    author = AuthorFactory()
+
+    response = bulk(
+        user,
+        "post",
+        [{"title": "A", "author": author.pk}, {"title": "B", "author": author.pk}],
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert [book["title"] for book in response.data] == ["A", "B"]
+    assert set(Book.objects.values_list("title", "created_by")) == {
+        ("A", user.pk),
+        ("B", user.pk),
+    }
+
+
+def test_bulk_create_is_validated(user):
+    response = bulk(
+        user,
+        "post",
+        [{"title": "A", "author": AuthorFactory().pk}, {"title": "B"}],
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert not Book.objects.exists()
+
+
+def test_bulk_partial_update(user):
+    books = BookFactory.create_batch(2)
+
+    # Ids are coerced to the type of the pk
+    response = bulk(
+        user,
+        "patch",
+        [{"id": str(book.pk), "title": f"New {i}"} for i, book in enumerate(books)],
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert dict(Book.objects.values_list("pk", "title")) == {
+        books[0].pk: "New 0",
+        books[1].pk: "New 1",
+    }
+
+
+def test_bulk_partial_update_reports_locked_objects(user):
+    book = BookFactory(title="Old")
+    locked_book = BookFactory(locked=True, title="Locked")
+
+    response = bulk(
+        user,
+        "patch",
+        [{"id": book.pk, "title": "New"}, {"id": locked_book.pk, "title": "New"}],
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    errors = get_item_errors(response)
+    assert list(errors) == [1]
+    assert errors[1]["non_field_errors"][0].code == "locked"
+    assert dict(Book.objects.values_list("pk", "title")) == {
+        book.pk: "Old",
+        locked_book.pk: "Locked",
+    }
+
+
+def test_bulk_partial_update_rejects_plain_ids(user):
+    book = BookFactory(title="Old")
+
+    response = bulk(user, "patch", [book.pk])
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert Book.objects.get().title == "Old"
+
+
+def test_bulk_destroy_leaves_locked_objects_alone(user):
+    book, locked_book = BookFactory(), BookFactory(locked=True)
+
+    response = bulk(user, "delete", [str(book.pk), {"id": locked_book.pk}])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["detail"] == "1 objects deleted successfully."
+    assert set(Book.objects.all_objects().values_list("pk", "is_deleted")) == {
+        (book.pk, True),
+        (locked_book.pk, False),
+    }
+
+
+@pytest.mark.parametrize(
+    ("data", "status_code"),
+    [
+        ([], status.HTTP_400_BAD_REQUEST),
+        ({"id": 1}, status.HTTP_400_BAD_REQUEST),
+        (["not-an-id"], status.HTTP_400_BAD_REQUEST),
+        ([{"title": "No id"}], status.HTTP_400_BAD_REQUEST),
+        ([1, "1"], status.HTTP_400_BAD_REQUEST),
+        ([0], status.HTTP_404_NOT_FOUND),
+    ],
+)
+@pytest.mark.parametrize("method", ["patch", "delete"])
+def test_bulk_ids_are_validated(user, method, data, status_code):
+    BookFactory(pk=1, title="Old")
+
+    response = bulk(user, method, data)
+
+    assert response.status_code == status_code
+    assert Book.objects.filter(title="Old", is_deleted=False).exists()
+
+
+@pytest.mark.parametrize("method", ["patch", "delete"])
+def test_bulk_object_permissions_are_checked(user, method):
+    book, locked_book = BookFactory(title="Old"), BookFactory(locked=True)
+
+    response = bulk(
+        user,
+        method,
+        [{"id": book.pk, "title": "New"}, {"id": locked_book.pk, "title": "New"}],
+        viewset=LockedForbiddenBookViewSet,
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert Book.objects.filter(pk=book.pk, title="Old", is_deleted=False).exists()
+
+
+def test_bulk_unique_fields_are_checked_per_item(user):
+    BookFactory(title="Taken")
+    author = AuthorFactory()
+
+    response = bulk(
+        user,
+        "post",
+        [
+            {"title": "Free", "author": author.pk},
+            {"title": "Taken", "author": author.pk},
+        ],
+        viewset=UniqueTitleBookViewSet,
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert get_item_errors(response) == {1: {"title": ["Taken already exists."]}}
+    assert not Book.objects.filter(title="Free").exists()
+
+
+def test_bulk_unique_fields_are_checked_at_once(user):
+    author = AuthorFactory()
+    data = [{"title": f"Book {i}", "author": author.pk} for i in range(5)]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = bulk(user, "post", data, viewset=UniqueTitleBookViewSet)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    title_lookups = [
+        query
+        for query in queries.captured_queries
+        if '"title"' in query["sql"].partition("WHERE")[2]
+    ]
+    assert len(title_lookups) == 1
+
+
+def test_bulk_unique_fields_exclude_the_updated_object(user):
+    book, other_book = BookFactory(title="Kept"), BookFactory(title="Other")
+    BookFactory(title="Taken")
+
+    response = bulk(
+        user,
+        "patch",
+        [{"id": book.pk, "title": "Kept"}, {"id": other_book.pk, "title": "Taken"}],
+        viewset=UniqueTitleBookViewSet,
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert get_item_errors(response) == {1: {"title": ["Taken already exists."]}}
+
+    response = bulk(
+        user,
+        "patch",
+        [{"id": book.pk, "title": "Kept"}, {"id": other_book.pk, "title": "New"}],
+        viewset=UniqueTitleBookViewSet,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(Book.objects.values_list("title", flat=True)) == {
+        "Kept",
+        "New",
+        "Taken",
+    }
+
+
+def test_bulk_unique_fields_including_deleted_report_the_trash(user):
+    BookFactory(title="Trashed", is_deleted=True)
+    author = AuthorFactory()
+
+    response = bulk(
+        user,
+        "post",
+        [{"title": "Trashed", "author": author.pk}],
+        viewset=UniqueTitleIncludingDeletedBookViewSet,
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert get_item_errors(response) == {
+        0: {"title": ["Trashed already exists in trash. Please restore and use it."]},
+    }
@@ -0,0 +1,70 @@
+import pytest
+from django.core.cache import cache
+from django.db.models import Count
+from django.db.models import Max
+
+from {{ cookiecutter.project_slug }}.base.caching import get_cached_aggregate
+from {{ cookiecutter.project_slug }}.base.caching import get_cached_count
+from {{ cookiecutter.project_slug }}.base.tests.factories import BookFactory
+from {{ cookiecutter.project_slug }}.base.tests.models import Book
+
+pytestmark = pytest.mark.django_db
+
+EMPTY_QUERYSETS = pytest.mark.parametrize(
+    "queryset",
+    [Book.objects.none(), Book.objects.filter(pk__in=[])],
+    ids=["none", "empty_in"],
+)
+
+
+@pytest.fixture
+def cache_writes(monkeypatch):
+    keys = []
+    set_value = cache.set
+
+    def record(key, *args, **kwargs):
+        keys.append(key)
+        return set_value(key, *args, **kwargs)
+
+    monkeypatch.setattr(cache, "set", record)
+    return keys
+
+
+@EMPTY_QUERYSETS
+def test_empty_queryset_count(django_assert_num_queries, cache_writes, queryset):
+    BookFactory()
+
+    with django_assert_num_queries(0):
+        assert get_cached_count(queryset) == 0
+    assert not cache_writes
+
+
+@EMPTY_QUERYSETS
+def test_empty_queryset_aggregate(django_assert_num_queries, cache_writes, queryset):
+    BookFactory()
+
+    with django_assert_num_queries(0):
+        aggregate = get_cached_aggregate(
+            queryset,
+            count=Count("pk"),
+            latest=Max("updated_at"),
+        )
+
+    assert aggregate == {"count": 0, "latest": None}
+    assert not cache_writes
+
+
+def test_count_is_cached_until_the_next_write(
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    books = BookFactory.create_batch(2)
+    queryset = Book.objects.filter(title__isnull=False)
+    assert get_cached_count(queryset) == len(books)
+
+    with django_assert_num_queries(0):
+        assert get_cached_count(queryset) == len(books)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        BookFactory()
+    assert get_cached_count(queryset) == len(books) + 1
@@ -0,0 +1,76 @@
+import pytest
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from {{ cookiecutter.project_slug }}.base.tests.factories import BookFactory
+from {{ cookiecutter.project_slug }}.base.tests.views import BookViewSet
+
+pytestmark = pytest.mark.django_db
+
+
+class NoBookViewSet(BookViewSet):
+    def get_queryset(self):
+        return super().get_queryset().filter(pk__in=[])
+
+
+def get_list(user, viewset=BookViewSet, **headers):
+    request = APIRequestFactory().get("/books/", **headers)
+    force_authenticate(request, user)
+    return viewset.as_view({"get": "list"})(request)
+
+
+def test_empty_list_is_not_modified(user):
+    response = get_list(user)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == []
+    assert "Last-Modified" not in response
+
+    response = get_list(user, HTTP_IF_NONE_MATCH=response["ETag"])
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+def test_list_is_modified_by_writes(user, django_capture_on_commit_callbacks):
+    book = BookFactory()
+    etag = get_list(user)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        new_book = BookFactory()
+    response = get_list(user, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {row["id"] for row in response.data["results"]} == {book.pk, new_book.pk}
+    assert response["ETag"] != etag
+
+
+def test_list_is_modified_by_deletes(user, django_capture_on_commit_callbacks):
+    books = BookFactory.create_batch(2)
+    response = get_list(user)
+    assert "Last-Modified" not in response
+    etag = response["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        books[0].hard_delete()
+    if_modified_since = http_date(timezone.now().timestamp())
+
+    response = get_list(user, HTTP_IF_MODIFIED_SINCE=if_modified_since)
+    assert response.status_code == status.HTTP_200_OK
+    assert [row["id"] for row in response.data["results"]] == [books[1].pk]
+
+    response = get_list(user, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response["ETag"] != etag
+
+
+def test_queryset_matching_no_row_is_not_validated(user):
+    BookFactory()
+
+    response = get_list(user, NoBookViewSet)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["results"] == []
+    assert "ETag" not in response
@@ -0,0 +1,178 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from {{ cookiecutter.project_slug }}.base.api.eager_loading import get_eager_loading
+from {{ cookiecutter.project_slug }}.base.api.serializers import BaseModelSerializer
+from {{ cookiecutter.project_slug }}.base.tests.factories import BookFactory
+from {{ cookiecutter.project_slug }}.base.tests.models import Author
+from {{ cookiecutter.project_slug }}.base.tests.models import AuthorProfile
+from {{ cookiecutter.project_slug }}.base.tests.models import Book
+from {{ cookiecutter.project_slug }}.base.tests.views import BookViewSet
+
+
+class AuthorProfileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AuthorProfile
+        fields = ["id", "bio"]
+
+
+class BookSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Book
+        fields = ["id", "title", "author"]
+
+
+class AuthorSerializer(serializers.ModelSerializer):
+    # Reverse relations without related_name
+    book_set = BookSerializer(many=True, read_only=True)
+    authorprofile = AuthorProfileSerializer(read_only=True)
+
+    class Meta:
+        model = Author
+        fields = ["id", "name", "book_set", "authorprofile"]
+
+
+class BookWithAuthorSerializer(serializers.ModelSerializer):
+    author = AuthorSerializer(read_only=True)
+
+    class Meta:
+        model = Book
+        fields = ["id", "title", "author"]
+
+
+class NestedAuthorSerializer(BaseModelSerializer):
+    class Meta(BaseModelSerializer.Meta):
+        model = Author
+        fields = (*BaseModelSerializer.Meta.fields, "name")
+
+
+class NestedBookSerializer(BaseModelSerializer):
+    author = NestedAuthorSerializer(read_only=True)
+
+    class Meta(BaseModelSerializer.Meta):
+        model = Book
+        fields = (*BaseModelSerializer.Meta.fields, "title", "author")
+
+
+class NestedBookViewSet(BookViewSet):
+    serializer_class = NestedBookSerializer
+    # Leaves the list query alone
+    conditional_requests = False
+
+
+def get_queryset(user, query: dict):
+    request = APIRequestFactory().get("/books/", query)
+    force_authenticate(request, user)
+    view = NestedBookViewSet(
+        action="list",
+        action_map={"get": "list"},
+        kwargs={},
+        format_kwarg=None,
+    )
+    view.request = view.initialize_request(request)
+    return view.get_queryset()
+
+
+def get_books(user, query: dict) -> tuple[list[dict], list[str]]:
+    """
+    Returns the listed books and the SQL of the queries
+    """
+    request = APIRequestFactory().get("/books/", query)
+    force_authenticate(request, user)
+    with CaptureQueriesContext(connection) as queries:
+        response = NestedBookViewSet.as_view({"get": "list"})(request)
+    return response.data["results"], [query["sql"] for query in queries]
+
+
+def test_reverse_relations():
+    assert get_eager_loading(AuthorSerializer) == (("authorprofile",), ("book_set",))
+
+
+def test_nested_reverse_relations():
+    assert get_eager_loading(BookWithAuthorSerializer) == (
+        ("author__authorprofile",),
+        ("author__book_set",),
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "serializer_class",
+    [AuthorSerializer, BookWithAuthorSerializer],
+)
+def test_lookups_load_everything(django_assert_num_queries, serializer_class):
+    for book in BookFactory.create_batch(2):
+        AuthorProfile.objects.create(author=book.author, bio="Bio")
+    model = serializer_class.Meta.model
+    select_related, prefetch_related = get_eager_loading(serializer_class)
+
+    # One query for the rows and their joined relations, one for the prefetch
+    with django_assert_num_queries(2):
+        queryset = model.objects.select_related(*select_related).prefetch_related(
+            *prefetch_related,
+        )
+        data = serializer_class(queryset, many=True).data
+
+    assert len(data) == model.objects.count()
+
+
+@pytest.mark.django_db
+def test_fields_keep_only_the_requested_fields(user):
+    BookFactory.create_batch(2)
+
+    books, queries = get_books(user, {"fields": "id,title"})
+
+    assert [set(book) for book in books] == [{"id", "title"}] * 2
+    assert len(queries) == 1
+    assert "JOIN" not in queries[0]
+
+
+@pytest.mark.django_db
+def test_fields_load_only_the_columns_read(user):
+    queryset = get_queryset(user, {"fields": "id,title"})
+
+    assert not queryset.query.select_related
+    # The pagination orders by created_at
+    assert queryset.query.deferred_loading == ({"id", "title", "created_at"}, False)
+
+
+@pytest.mark.django_db
+def test_unknown_fields_are_ignored(user):
+    BookFactory()
+
+    books, _ = get_books(user, {"fields": "id,unknown"})
+
+    assert [set(book) for book in books] == [{"id"}]
+
+
+@pytest.mark.django_db
+def test_nested_objects_not_expanded_are_primary_keys(user):
+    books = BookFactory.create_batch(2)
+
+    data, queries = get_books(user, {"fields": "id,author", "expand": ""})
+
+    assert {book["author"] for book in data} == {book.author_id for book in books}
+    assert len(queries) == 1
+    assert "JOIN" not in queries[0]
+    queryset = get_queryset(user, {"fields": "id,author", "expand": ""})
+    assert queryset.query.deferred_loading == ({"id", "author", "created_at"}, False)
+
+
+@pytest.mark.django_db
+def test_expanded_objects_are_joined(user):
+    books = BookFactory.create_batch(3)
+
+    data, queries = get_books(user, {"fields": "id,author", "expand": "author"})
+
+    assert {book["author"]["name"] for book in data} == {
+        book.author.name for book in books
+    }
+    # The authors are joined instead of read one by one
+    assert len(queries) == 1
+    queryset = get_queryset(user, {"fields": "id,author", "expand": "author"})
+    assert "author" in queryset.query.select_related
+    assert "created_by" not in queryset.query.select_related
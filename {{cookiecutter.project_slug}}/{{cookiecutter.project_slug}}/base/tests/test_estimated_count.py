@@ -0,0 +1,130 @@
+import pytest
+from django.db import connection
+
+from {{ cookiecutter.project_slug }}.base import pagination
+from {{ cookiecutter.project_slug }}.base.pagination import EstimatedCountPaginator
+from {{ cookiecutter.project_slug }}.base.pagination import get_count
+from {{ cookiecutter.project_slug }}.base.pagination import get_estimated_count
+from {{ cookiecutter.project_slug }}.base.tests.factories import BookFactory
+from {{ cookiecutter.project_slug }}.base.tests.models import Book
+
+pytestmark = pytest.mark.django_db
+
+requires_postgresql = pytest.mark.skipif(
+    connection.vendor != "postgresql",
+    reason="Row estimates come from PostgreSQL",
+)
+
+
+@pytest.fixture
+def estimate(monkeypatch):
+    """
+    Sets the row estimate of every queryset
+    """
+
+    def set_estimate(value: int | None):
+        monkeypatch.setattr(pagination, "get_estimated_count", lambda queryset: value)
+
+    return set_estimate
+
+
+@pytest.fixture
+def analyzed_books():
+    books = BookFactory.create_batch(5)
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {connection.ops.quote_name(Book._meta.db_table)}")  # noqa: SLF001
+    return books
+
+
+def test_estimate_over_the_threshold_skips_the_count(
+    settings,
+    estimate,
+    django_assert_num_queries,
+):
+    settings.ESTIMATED_COUNT_THRESHOLD = 100
+    estimate(settings.ESTIMATED_COUNT_THRESHOLD + 1)
+
+    with django_assert_num_queries(0):
+        assert get_count(Book.objects.all()) == (
+            settings.ESTIMATED_COUNT_THRESHOLD + 1,
+            True,
+        )
+
+
+@pytest.mark.parametrize("estimated_rows", [100, None])
+def test_estimate_under_the_threshold_or_unknown_counts_exactly(
+    settings,
+    estimate,
+    estimated_rows,
+):
+    settings.ESTIMATED_COUNT_THRESHOLD = 100
+    estimate(estimated_rows)
+    books = BookFactory.create_batch(3)
+
+    assert get_count(Book.objects.all()) == (len(books), False)
+
+
+@pytest.mark.skipif(
+    connection.vendor == "postgresql",
+    reason="PostgreSQL estimates rows",
+)
+def test_no_estimate_without_postgresql(django_assert_num_queries):
+    with django_assert_num_queries(0):
+        assert get_estimated_count(Book.objects.all()) is None
+
+
+@requires_postgresql
+def test_whole_table_estimate_is_the_table_statistics(analyzed_books):
+    # No WHERE clause, read from pg_class.reltuples
+    assert get_estimated_count(Book.objects.all_objects()) == len(analyzed_books)
+
+
+@requires_postgresql
+def test_filtered_estimate_is_the_query_plan(analyzed_books):
+    estimated_rows = get_estimated_count(Book.objects.filter(title__startswith="x"))
+
+    assert isinstance(estimated_rows, int)
+    assert estimated_rows >= 0
+
+
+@requires_postgresql
+def test_postgresql_estimate_on_both_sides_of_the_threshold(analyzed_books):
+    queryset = Book.objects.all_objects()
+    rows = len(analyzed_books)
+
+    assert get_count(queryset, threshold=rows - 1) == (rows, True)
+    assert get_count(queryset, threshold=rows) == (rows, False)
+
+
+def test_admin_paginator_uses_the_estimate(settings, estimate):
+    settings.ESTIMATED_COUNT_THRESHOLD = 100
+    estimated_rows = settings.ESTIMATED_COUNT_THRESHOLD * 10
+    estimate(estimated_rows)
+    per_page = 100
+
+    paginator = EstimatedCountPaginator(Book.objects.all(), per_page)
+
+    assert paginator.count == estimated_rows
+    assert paginator.count_is_estimated
+    assert paginator.num_pages == estimated_rows // per_page
+
+
+def test_admin_paginator_counts_small_tables_exactly(settings, estimate):
+    settings.ESTIMATED_COUNT_THRESHOLD = 100
+    estimate(settings.ESTIMATED_COUNT_THRESHOLD)
+    books = BookFactory.create_batch(3)
+
+    paginator = EstimatedCountPaginator(Book.objects.all(), 2)
+
+    assert paginator.count == len(books)
+    assert not paginator.count_is_estimated
+    assert paginator.num_pages == len(books) - 1
+
+
+def test_admin_paginator_counts_lists(estimate):
+    estimate(1_000_000)
+
+    paginator = EstimatedCountPaginator(list(range(3)), 2)
+
+    assert paginator.count == len(paginator.object_list)
+    assert not paginator.count_is_estimated
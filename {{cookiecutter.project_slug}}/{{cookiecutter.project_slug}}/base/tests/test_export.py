@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+
+import pytest
+from django.db import transaction
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from {{ cookiecutter.project_slug }}.base.tests.factories import BookFactory
+from {{ cookiecutter.project_slug }}.base.tests.views import BookViewSet
+
+pytestmark = pytest.mark.django_db
+
+
+def export(user, data=None, headers=None, **initkwargs):
+    request = APIRequestFactory().get("/books/export/", data, headers=headers)
+    if user is not None:
+        force_authenticate(request, user)
+    # As ATOMIC_REQUESTS does, errors roll the request back
+    with transaction.atomic():
+        # The router passes the renderers and throttles of the action
+        initkwargs = {**BookViewSet.export.kwargs, **initkwargs}
+        response = BookViewSet.as_view({"get": "export"}, **initkwargs)(request)
+    if not response.streaming:
+        response.render()
+    return response
+
+
+def read(response) -> str:
+    content = b"".join(response.streaming_content).decode()
+    response.close()
+    return content
+
+
+def test_export_streams_csv(user):
+    books = BookFactory.create_batch(3)
+
+    response = export(user)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "text/csv"
+    assert response["Content-Disposition"] == 'attachment; filename="book.csv"'
+    rows = list(csv.DictReader(io.StringIO(read(response))))
+    assert {int(row["id"]) for row in rows} == {book.pk for book in books}
+    assert {row["title"] for row in rows} == {book.title for book in books}
+
+
+@pytest.mark.parametrize(
+    ("data", "headers"),
+    [
+        ({"format": "ndjson"}, None),
+        (None, {"accept": "application/x-ndjson"}),
+    ],
+)
+def test_export_streams_ndjson(user, data, headers):
+    books = BookFactory.create_batch(3)
+
+    response = export(user, data, headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert response["Content-Disposition"] == 'attachment; filename="book.ndjson"'
+    rows = [json.loads(line) for line in read(response).splitlines()]
+    assert {row["id"] for row in rows} == {book.pk for book in books}
+
+
+def test_csv_and_ndjson_exports_have_the_same_fields(user):
+    BookFactory()
+
+    csv_fields = csv.DictReader(io.StringIO(read(export(user)))).fieldnames
+    ndjson_row = json.loads(read(export(user, {"format": "ndjson"})))
+
+    assert csv_fields == list(ndjson_row)
+
+
+def test_export_follows_the_list_filters(user):
+    BookFactory.create_batch(2)
+    matching = BookFactory.create_batch(2, title="Exported")
+
+    response = export(
+        user,
+        {"format": "ndjson", "search": "Exported"},
+        search_fields=["title"],
+    )
+
+    rows = [json.loads(line) for line in read(response).splitlines()]
+    assert {row["id"] for row in rows} == {book.pk for book in matching}
+
+
+def test_export_errors_are_json(user):
+    response = export(None, {"format": "ndjson"})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response["Content-Type"] == "application/json"
+    assert "detail" in json.loads(response.content)
+
+
+def test_export_uses_up_the_export_budget(settings, user):
+    cost = BookViewSet.export.kwargs["throttle_cost"]
+    settings.THROTTLE_SCOPES = {
+        **settings.THROTTLE_SCOPES,
+        "export": {"algorithm": "gcra", "timeout": 3600, "request_limit": cost * 2},
+    }
+
+    for _ in range(2):
+        response = export(user)
+        assert response.status_code == status.HTTP_200_OK
+        read(response)
+
+    response = export(user)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert response["Content-Type"] == "application/json"
+    assert json.loads(response.content)["detail"].startswith("Too many attempts.")
@@ -0,0 +1,176 @@
+import math
+import time
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework import status
+
+from {{ cookiecutter.project_slug }}.base import load_shedding
+from {{ cookiecutter.project_slug }}.base.load_shedding import LOAD_SHEDDING_PRIORITIES
+from {{ cookiecutter.project_slug }}.base.load_shedding import AdmissionController
+from {{ cookiecutter.project_slug }}.base.middlewares import LoadSheddingMiddleware
+from {{ cookiecutter.project_slug }}.base.tests.views import BookViewSet
+
+TARGET = 0.05
+INTERVAL = 0.5
+QUEUED = TARGET * 2
+
+
+class Monotonic:
+    """
+    Stands in for `time.monotonic`, moved forward by hand
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def monotonic(monkeypatch):
+    monotonic = Monotonic()
+    monkeypatch.setattr(load_shedding.time, "monotonic", monotonic)
+    return monotonic
+
+
+@pytest.fixture
+def controller(monotonic):
+    return AdmissionController(target=TARGET, interval=INTERVAL, max_in_flight=2)
+
+
+@pytest.fixture
+def middleware(settings, monotonic):
+    settings.LOAD_SHEDDING_TARGET = TARGET
+    settings.LOAD_SHEDDING_INTERVAL = INTERVAL
+    return LoadSheddingMiddleware(lambda request: HttpResponse())
+
+
+def arrive(controller, monotonic, queue_delay, seconds=INTERVAL):
+    """
+    Registers requests with the queueing delay for `seconds`, one every eighth
+    of the interval
+    """
+    step = INTERVAL / 8
+    for _ in range(round(seconds / step)):
+        monotonic.now += step
+        controller.begin(queue_delay)
+        controller.end()
+
+
+def get_shed(controller) -> list[str]:
+    return [
+        name
+        for name, priority in LOAD_SHEDDING_PRIORITIES.items()
+        if controller.should_shed(priority)
+    ]
+
+
+def get_view(priority: str):
+    return BookViewSet.as_view({"get": "list"}, load_shedding_priority=priority)
+
+
+def test_standing_queue_sheds_one_more_priority_per_interval(controller, monotonic):
+    arrive(controller, monotonic, QUEUED, INTERVAL)
+    assert get_shed(controller) == ["low"]
+
+    arrive(controller, monotonic, QUEUED, INTERVAL)
+    assert get_shed(controller) == ["low", "normal"]
+
+    # "high" and "critical" are never shed
+    arrive(controller, monotonic, QUEUED, INTERVAL * 4)
+    assert get_shed(controller) == ["low", "normal"]
+
+
+def test_a_request_under_the_target_clears_the_queue(controller, monotonic):
+    arrive(controller, monotonic, QUEUED, INTERVAL * 2)
+    assert get_shed(controller) == ["low", "normal"]
+
+    arrive(controller, monotonic, 0, INTERVAL / 8)
+    arrive(controller, monotonic, QUEUED, INTERVAL)
+    assert get_shed(controller) == []
+
+
+def test_an_idle_interval_clears_the_queue(controller, monotonic):
+    arrive(controller, monotonic, QUEUED, INTERVAL)
+    assert get_shed(controller) == ["low"]
+
+    monotonic.now += INTERVAL
+    arrive(controller, monotonic, QUEUED, INTERVAL / 8)
+    assert get_shed(controller) == []
+
+
+def test_without_queueing_delay_taking_the_last_thread_counts_as_queued(
+    controller,
+    monotonic,
+):
+    arrive(controller, monotonic, None, INTERVAL * 2)
+    assert get_shed(controller) == []
+
+    # Holds one of the two threads, it found the other one free
+    controller.begin()
+    arrive(controller, monotonic, None, INTERVAL * 3)
+    assert get_shed(controller) == ["low", "normal"]
+    controller.end()
+
+
+@pytest.mark.parametrize("priority", ["low", "normal"])
+def test_overloaded_worker_rejects_lower_priorities(middleware, priority):
+    middleware.controller.overloaded_intervals = 2
+    request = RequestFactory().get("/books/")
+
+    response = middleware.process_view(request, get_view(priority), (), {})
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert response["Retry-After"] == str(math.ceil(INTERVAL * 2))
+
+
+@pytest.mark.parametrize("priority", ["high", "critical"])
+def test_overloaded_worker_serves_higher_priorities(middleware, priority):
+    middleware.controller.overloaded_intervals = 2
+    request = RequestFactory().get("/books/")
+
+    assert middleware.process_view(request, get_view(priority), (), {}) is None
+
+
+def test_requests_queued_behind_the_proxy_shed_low_priorities(middleware, monotonic):
+    request_start = time.time() - QUEUED
+    request = RequestFactory().get(
+        "/books/",
+        headers={"x-request-start": f"t={request_start:.6f}"},
+    )
+    for _ in range(9):
+        monotonic.now += INTERVAL / 8
+        middleware(request)
+
+    assert middleware.process_view(request, get_view("low"), (), {})
+    assert middleware.process_view(request, get_view("normal"), (), {}) is None
+
+
+@pytest.mark.parametrize(
+    ("unit", "header"),
+    [
+        (1, "t={:.6f}"),
+        (1, "{:.3f}"),
+        (1_000, "t={:.0f}"),
+        (1_000_000, "t={:.0f}"),
+    ],
+)
+def test_queue_delay_is_read_in_any_unit(middleware, unit, header):
+    request_start = (time.time() - QUEUED) * unit
+    request = RequestFactory().get(
+        "/",
+        headers={"x-request-start": header.format(request_start)},
+    )
+
+    assert middleware._get_queue_delay(request) == pytest.approx(QUEUED, abs=0.05)  # noqa: SLF001
+
+
+@pytest.mark.parametrize("header", [None, "", "t=soon"])
+def test_queue_delay_is_unknown_without_a_valid_header(middleware, header):
+    headers = {} if header is None else {"x-request-start": header}
+    request = RequestFactory().get("/", headers=headers)
+
+    assert middleware._get_queue_delay(request) is None  # noqa: SLF001
@@ -0,0 +1,76 @@
+import pytest
+
+from {{ cookiecutter.project_slug }}.base.caching import get_model_generation
+from {{ cookiecutter.project_slug }}.base.tests.factories import BookFactory
+from {{ cookiecutter.project_slug }}.base.tests.models import Book
+
+pytestmark = pytest.mark.django_db
+
+WRITES = {
+    "update": lambda books: Book.objects.filter(pk=books[0].pk).update(title="Updated"),
+    "delete": lambda books: Book.objects.filter(pk=books[0].pk).delete(),
+    "bulk_create": lambda books: Book.objects.bulk_create(
+        [Book(title="New", author=books[0].author)],
+    ),
+    "bulk_update": lambda books: Book.objects.bulk_update(books, ["title"]),
+    "soft_delete": lambda books: Book.objects.soft_delete(),
+    "restore": lambda books: Book.objects.all_objects().restore(),
+    "hard_delete": lambda books: Book.objects.hard_delete(),
+}
+
+
+@pytest.mark.parametrize("write", list(WRITES))
+def test_writes_bump_the_generation_on_commit(
+    django_capture_on_commit_callbacks,
+    write,
+):
+    books = BookFactory.create_batch(2)
+    generation = get_model_generation(Book)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        WRITES[write](books)
+
+    assert get_model_generation(Book) == generation
+    for callback in callbacks:
+        callback()
+    assert get_model_generation(Book) == generation + 1
+
+
+def test_soft_delete_skips_locked_rows(user):
+    unlocked = BookFactory.create_batch(2)
+    locked = BookFactory(locked=True)
+
+    assert Book.objects.soft_delete(deleted_by=user) == len(unlocked)
+
+    assert list(Book.objects.all()) == [locked]
+    for book in Book.objects.deleted():
+        assert book.deleted_by == user
+        assert book.deleted_at
+    assert {book.pk for book in Book.objects.deleted()} == {
+        book.pk for book in unlocked
+    }
+    # Already deleted rows are left alone
+    assert Book.objects.all_objects().soft_delete() == 0
+
+
+def test_restore_includes_locked_rows():
+    books = BookFactory.create_batch(2)
+    Book.objects.soft_delete()
+    Book.objects.all_objects().filter(pk=books[0].pk).update(locked=True)
+
+    assert Book.objects.all_objects().restore() == len(books)
+
+    assert not Book.objects.deleted().exists()
+    for book in Book.objects.all():
+        assert book.deleted_at is None
+        assert book.deleted_by is None
+
+
+def test_hard_delete_skips_locked_rows():
+    unlocked = BookFactory.create_batch(2)
+    locked = BookFactory(locked=True)
+
+    deleted, _ = Book.objects.hard_delete()
+
+    assert deleted == len(unlocked)
+    assert list(Book.objects.all_objects()) == [locked]
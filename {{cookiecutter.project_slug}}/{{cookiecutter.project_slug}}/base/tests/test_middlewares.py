@@ -0,0 +1,92 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from {{ cookiecutter.project_slug }}.base.throttling import get_throttle_policy
+from {{ cookiecutter.project_slug }}.base.throttling import local_deny_cache
+
+pytestmark = pytest.mark.django_db
+
+CREDENTIALS = {"HTTP_AUTHORIZATION": "Bearer invalid"}
+
+
+@pytest.fixture(autouse=True)
+def _clear_local_deny_cache():
+    yield
+    local_deny_cache.clear()
+
+
+@pytest.fixture
+def request_limit():
+    return get_throttle_policy("token_obtain", "anonymous")["request_limit"]
+
+
+def obtain_token(client, **extra):
+    return client.post(
+        reverse("token_obtain_pair"),
+        {"username": "nobody", "email": "nobody@example.com", "password": "wrong"},
+        **extra,
+    )
+
+
+def test_token_requests_over_the_limit_skip_the_database(
+    client,
+    request_limit,
+    django_assert_num_queries,
+):
+    for _ in range(request_limit):
+        assert obtain_token(client).status_code != status.HTTP_429_TOO_MANY_REQUESTS
+
+    with django_assert_num_queries(0):
+        response = obtain_token(client)
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response["Retry-After"]) > 0
+
+
+def test_token_refresh_does_not_use_the_token_budget(client, request_limit):
+    for _ in range(request_limit + 1):
+        response = client.post(reverse("token_refresh"), {"refresh": "invalid"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    assert obtain_token(client).status_code != status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_credentials_to_a_view_without_authentication_are_counted(
+    client,
+    request_limit,
+):
+    # The token views ignore the Authorization header, it proves nothing
+    for _ in range(request_limit):
+        response = obtain_token(client, **CREDENTIALS)
+        assert response.status_code != status.HTTP_429_TOO_MANY_REQUESTS
+
+    response = obtain_token(client, **CREDENTIALS)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_credentials_to_an_authenticating_view_are_not_counted(
+    client,
+    settings,
+    request_limit,
+):
+    settings.THROTTLE_MIDDLEWARE_URLS_REGEX = r"^/api/(token|users)/"
+
+    for _ in range(request_limit + 1):
+        response = client.get(reverse("api:user-me"), **CREDENTIALS)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    assert obtain_token(client).status_code != status.HTTP_429_TOO_MANY_REQUESTS
+
+
+def test_credentials_to_an_authenticating_view_are_rejected_once_denied(
+    client,
+    settings,
+    request_limit,
+):
+    settings.THROTTLE_MIDDLEWARE_URLS_REGEX = r"^/api/(token|users)/"
+    for _ in range(request_limit + 1):
+        obtain_token(client)
+
+    response = client.get(reverse("api:user-me"), **CREDENTIALS)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
@@ -0,0 +1,103 @@
+import pytest
+from django.db import models
+from django.db.migrations.state import ModelState
+from django.db.migrations.state import ProjectState
+from django.test.utils import isolate_apps
+
+from {{ cookiecutter.project_slug }}.base import checks
+from {{ cookiecutter.project_slug }}.base.models import BaseModel
+from {{ cookiecutter.project_slug }}.base.models import get_soft_delete_indexes
+from {{ cookiecutter.project_slug }}.base.tests.models import Book
+
+
+def get_index_names(model) -> set[str]:
+    return {index.name for index in model._meta.indexes}  # noqa: SLF001
+
+
+def use_migration_state(monkeypatch, *model_states):
+    state = ProjectState()
+    for model_state in model_states:
+        state.add_model(model_state)
+
+    class MigrationLoader:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def project_state(self):
+            return state
+
+    monkeypatch.setattr(checks, "MigrationLoader", MigrationLoader)
+
+
+def test_soft_delete_indexes_are_added_to_the_model():
+    indexes = get_soft_delete_indexes(Book)
+
+    assert [index.condition for index in indexes] == [
+        models.Q(is_deleted=False),
+        models.Q(is_deleted=True),
+        models.Q(is_deleted=False),
+    ]
+    assert {index.name for index in indexes} <= get_index_names(Book)
+    # Declared in Meta, so makemigrations sees them
+    assert Book._meta.original_attrs["indexes"] == Book._meta.indexes  # noqa: SLF001
+
+
+def test_soft_delete_index_names_are_derived_from_the_table():
+    names = [index.name for index in get_soft_delete_indexes(Book)]
+
+    assert len(set(names)) == len(names)
+    for name in names:
+        assert name.startswith(Book._meta.db_table[:16])  # noqa: SLF001
+        assert len(name) <= models.Index.max_name_length
+
+
+@isolate_apps("{{ cookiecutter.project_slug }}.base")
+def test_models_can_opt_out_of_the_soft_delete_indexes():
+    class Tag(BaseModel):
+        soft_delete_indexes = False
+
+        class Meta:
+            app_label = "base"
+
+    assert get_index_names(Tag) == set()
+
+
+@isolate_apps("{{ cookiecutter.project_slug }}.base")
+def test_soft_delete_indexes_are_added_to_the_table_with_the_columns():
+    class Parent(BaseModel):
+        class Meta:
+            app_label = "base"
+
+    class Child(Parent):
+        class Meta:
+            app_label = "base"
+
+    assert get_index_names(Parent) == {
+        index.name for index in get_soft_delete_indexes(Parent)
+    }
+    assert get_index_names(Child) == set()
+
+
+@pytest.mark.parametrize("migrated", [True, False])
+def test_missing_soft_delete_index_migrations_are_reported(monkeypatch, migrated):
+    model_state = ModelState.from_model(Book)
+    if not migrated:
+        model_state.options["indexes"] = []
+    use_migration_state(monkeypatch, model_state)
+
+    warnings = [
+        warning for warning in checks.check_soft_delete_indexes() if warning.obj is Book
+    ]
+
+    if migrated:
+        assert warnings == []
+    else:
+        assert [warning.id for warning in warnings] == ["base.W001"]
+        for index in get_soft_delete_indexes(Book):
+            assert index.name in warnings[0].msg
+
+
+def test_models_without_migrations_are_not_reported(monkeypatch):
+    use_migration_state(monkeypatch)
+
+    assert checks.check_soft_delete_indexes() == []
@@ -0,0 +1,98 @@
+import datetime
+import functools
+import operator
+
+import pytest
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from {{ cookiecutter.project_slug }}.base.api.pagination import KeysetPagination
+from {{ cookiecutter.project_slug }}.base.tests.factories import BookFactory
+from {{ cookiecutter.project_slug }}.base.tests.models import Book
+
+pytestmark = pytest.mark.django_db
+
+
+def get_page(url: str, ordering=None) -> tuple[list[int], str | None, str | None]:
+    paginator = KeysetPagination()
+    paginator.page_size = 3
+    if ordering:
+        paginator.ordering = ordering
+    request = Request(APIRequestFactory().get(url))
+    page = paginator.paginate_queryset(Book.objects.all(), request)
+    return (
+        [book.pk for book in page],
+        paginator.get_next_link(),
+        paginator.get_previous_link(),
+    )
+
+
+def walk(ordering=None) -> tuple[list[list[int]], list[list[int]]]:
+    """
+    Returns the pages following the next links, then the previous links back
+    """
+    forward = []
+    link = "/books/"
+    while link:
+        pks, link, previous = get_page(link, ordering)
+        forward.append(pks)
+
+    backward = [pks]
+    while previous:
+        pks, _, previous = get_page(previous, ordering)
+        backward.insert(0, pks)
+    return forward, backward
+
+
+def test_ties_are_broken_by_pk():
+    books = BookFactory.create_batch(8)
+    Book.objects.update(created_at=timezone.now())
+
+    forward, backward = walk()
+
+    expected = sorted((book.pk for book in books), reverse=True)
+    assert forward == [expected[:3], expected[3:6], expected[6:]]
+    assert backward == forward
+
+
+def test_nullable_ordering_sorts_nulls_last():
+    books = BookFactory.create_batch(7)
+    deleted_at = timezone.now()
+    Book.objects.filter(pk__in=[book.pk for book in books[:4]]).update(
+        deleted_at=deleted_at,
+    )
+    Book.objects.filter(pk=books[0].pk).update(
+        deleted_at=deleted_at - datetime.timedelta(days=1),
+    )
+
+    forward, backward = walk(ordering=("deleted_at",))
+
+    pks = [book.pk for book in books]
+    expected = [pks[0], *sorted(pks[1:4]), *sorted(pks[4:])]
+    assert functools.reduce(operator.iadd, forward, []) == expected
+    assert backward == forward
+
+
+def test_cursor_round_trip_keeps_microseconds():
+    paginator = KeysetPagination()
+    paginator.base_url = "http://testserver/books/?limit=3"
+    position = [
+        datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.UTC).isoformat(),
+        42,
+    ]
+
+    link = paginator.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+    cursor = paginator.decode_cursor(Request(APIRequestFactory().get(link)))
+
+    assert "limit=3" in link
+    assert cursor.position == position
+    assert cursor.reverse
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "e30=", "eyJwIjogMX0="])
+def test_invalid_cursor_is_not_found(cursor):
+    with pytest.raises(NotFound):
+        get_page(f"/books/?cursor={cursor}")
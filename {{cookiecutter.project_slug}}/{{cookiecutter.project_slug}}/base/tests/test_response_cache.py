@@ -0,0 +1,132 @@
+import pytest
+from django.db import connection
+from django.db import transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.permissions import BasePermission
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from {{ cookiecutter.project_slug }}.base.tests.factories import BookFactory
+from {{ cookiecutter.project_slug }}.base.tests.views import BookViewSet
+from {{ cookiecutter.project_slug }}.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class CachedBookViewSet(BookViewSet):
+    response_cache_timeout = 60
+
+
+class SharedCachedBookViewSet(CachedBookViewSet):
+    response_cache_per_user = False
+
+
+class CreatorPermission(BasePermission):
+    def has_object_permission(self, request, view, obj):
+        return obj.created_by == request.user
+
+
+class CreatorOnlyBookViewSet(SharedCachedBookViewSet):
+    permission_classes = [*BookViewSet.permission_classes, CreatorPermission]
+
+
+def get(user, path="/books/", viewset=CachedBookViewSet, host="testserver", **kwargs):
+    """
+    Returns the response and whether it was served from the cache, without
+    a query
+    """
+    request = APIRequestFactory().get(path, headers={"host": host})
+    force_authenticate(request, user)
+    action = "retrieve" if kwargs else "list"
+    # As ATOMIC_REQUESTS does, errors roll the request back
+    with transaction.atomic(), CaptureQueriesContext(connection) as queries:
+        response = viewset.as_view({"get": action})(request, **kwargs)
+        response.render()
+    return response, not queries.captured_queries
+
+
+def test_responses_are_cached(user):
+    book = BookFactory()
+
+    for path, kwargs in [("/books/", {}), (f"/books/{book.pk}/", {"pk": book.pk})]:
+        response, cached = get(user, path, **kwargs)
+        assert response.status_code == status.HTTP_200_OK
+        assert not cached
+
+        cached_response, cached = get(user, path, **kwargs)
+        assert cached
+        assert cached_response.data == response.data
+        assert cached_response["ETag"] == response["ETag"]
+
+
+def test_responses_are_keyed_by_query_params(user):
+    BookFactory.create_batch(2)
+    get(user, "/books/?limit=1")
+
+    response, cached = get(user, "/books/?limit=2")
+
+    assert not cached
+    assert len(response.data["results"]) == 2  # noqa: PLR2004
+    assert get(user, "/books/?limit=1")[1]
+
+
+def test_responses_are_keyed_by_user(user):
+    BookFactory()
+    get(user)
+
+    assert not get(UserFactory())[1]
+
+
+def test_shared_responses_are_keyed_by_kind_of_user(user):
+    BookFactory()
+    get(user, viewset=SharedCachedBookViewSet)
+
+    assert get(UserFactory(), viewset=SharedCachedBookViewSet)[1]
+    assert not get(UserFactory(is_superuser=True), viewset=SharedCachedBookViewSet)[1]
+
+
+def test_writes_invalidate_the_responses(user, django_capture_on_commit_callbacks):
+    book = BookFactory()
+    get(user)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        new_book = BookFactory()
+    response, cached = get(user)
+
+    assert not cached
+    assert {row["id"] for row in response.data["results"]} == {book.pk, new_book.pk}
+
+
+def test_uncached_by_default(user):
+    BookFactory()
+    get(user, viewset=BookViewSet)
+
+    assert not get(user, viewset=BookViewSet)[1]
+
+
+def test_responses_are_keyed_by_host(settings, user):
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "example.com"]
+    BookFactory.create_batch(2)
+    get(user, "/books/?limit=1")
+
+    response, cached = get(user, "/books/?limit=1", host="example.com")
+
+    assert not cached
+    assert response.data["next"].startswith("http://example.com/")
+
+
+def test_retrieve_checking_the_object_is_not_cached(user):
+    book = BookFactory(created_by=user)
+    path = f"/books/{book.pk}/"
+    assert get(user, path, CreatorOnlyBookViewSet, pk=book.pk)[0].status_code == (
+        status.HTTP_200_OK
+    )
+
+    response, cached = get(UserFactory(), path, CreatorOnlyBookViewSet, pk=book.pk)
+
+    assert not cached
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    # Lists do not check objects
+    get(user, viewset=CreatorOnlyBookViewSet)
+    assert get(UserFactory(), viewset=CreatorOnlyBookViewSet)[1]
@@ -0,0 +1,675 @@
+"""
+Tests of the throttle engines, with concurrency correctness tests and micro
+benchmarks.
+
+The algorithm tests run on the Python engines of the locmem cache with a
+frozen clock. The correctness tests run against an in-process fakeredis
+server. The benchmarks are excluded by default, run them with:
+
+    pytest -m benchmark -s {{ cookiecutter.project_slug }}/base/tests/test_throttling.py
+
+They report the decisions per second, the p50/p99 decision latency, the redis
+round trips per decision, the requests admitted over the limit and, for the
+escalating engines, the increments lost. The multi-process benchmarks need a
+real redis in THROTTLE_BENCHMARK_REDIS_URL, as fakeredis lives in a single
+process.
+"""
+
+import datetime
+import json
+import logging
+import multiprocessing
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from fakeredis import FakeRedisConnection
+from fakeredis import FakeServer
+from redis import Connection
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from {{ cookiecutter.project_slug }}.base import throttling
+from {{ cookiecutter.project_slug }}.base.tests.views import BookViewSet
+from {{ cookiecutter.project_slug }}.base.throttling import AnonymousRequestThrottles
+from {{ cookiecutter.project_slug }}.base.throttling import AtomicThrottleCache
+from {{ cookiecutter.project_slug }}.base.throttling import ConcurrencyLimiter
+from {{ cookiecutter.project_slug }}.base.throttling import GCRAThrottleCache
+from {{ cookiecutter.project_slug }}.base.throttling import LocalDenyCache
+from {{ cookiecutter.project_slug }}.base.throttling import SlidingWindowThrottleCache
+from {{ cookiecutter.project_slug }}.base.throttling import ThrottleCache
+from {{ cookiecutter.project_slug }}.base.throttling import ThrottleDecisionCounter
+from {{ cookiecutter.project_slug }}.base.throttling import ThrottleInfo
+from {{ cookiecutter.project_slug }}.base.throttling import get_throttle_algorithm
+from {{ cookiecutter.project_slug }}.base.throttling import get_throttle_decision_counts
+from {{ cookiecutter.project_slug }}.base.throttling import get_throttle_policy
+from {{ cookiecutter.project_slug }}.base.throttling import get_user_tier
+from {{ cookiecutter.project_slug }}.base.throttling import local_deny_cache
+from {{ cookiecutter.project_slug }}.base.throttling import reset_throttle
+from {{ cookiecutter.project_slug }}.users.tests.factories import UserFactory
+
+ENGINES = {
+    "python": f"{ThrottleCache.__module__}.ThrottleCache",
+    "escalating": "escalating",
+    "gcra": "gcra",
+    "sliding_window": "sliding_window",
+}
+ATOMIC_ENGINES = ["escalating", "gcra", "sliding_window"]
+TIERED_POLICY = {
+    "algorithm": "gcra",
+    "timeout": 60,
+    "request_limit": 2,
+    "tiers": {
+        "user": {"request_limit": 3},
+        "staff": {"algorithm": "sliding_window", "request_limit": 4},
+        "superuser": None,
+    },
+}
+
+
+class RoundTrips:
+    count = 0
+    lock = threading.Lock()
+
+    @classmethod
+    def add(cls):
+        with cls.lock:
+            cls.count += 1
+
+    @classmethod
+    def reset(cls):
+        with cls.lock:
+            cls.count = 0
+
+
+class CountingConnection(Connection):
+    def send_packed_command(self, *args, **kwargs):
+        RoundTrips.add()
+        return super().send_packed_command(*args, **kwargs)
+
+
+class CountingFakeConnection(FakeRedisConnection):
+    def send_packed_command(self, *args, **kwargs):
+        RoundTrips.add()
+        return super().send_packed_command(*args, **kwargs)
+
+
+class Clock:
+    """
+    Stands in for `timezone.now`, moved forward by hand
+    """
+
+    def __init__(self, timestamp: float):
+        self.timestamp = timestamp
+
+    def __call__(self) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.timestamp, tz=datetime.UTC)
+
+    def advance(self, seconds: float):
+        self.timestamp += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # At the start of a minute, so it also starts a window of 60 seconds
+    clock = Clock(1_700_000_040.0)
+    monkeypatch.setattr(timezone, "now", clock)
+    return clock
+
+
+@pytest.fixture
+def decision_counter(monkeypatch):
+    # Only written to cache when flushed
+    decision_counter = ThrottleDecisionCounter(flush_interval=3600)
+    monkeypatch.setattr(throttling, "throttle_decision_counter", decision_counter)
+    return decision_counter
+
+
+@pytest.fixture
+def book_scopes(settings):
+    settings.THROTTLE_SCOPES = {
+        **settings.THROTTLE_SCOPES,
+        "books": TIERED_POLICY,
+        "trash": {"algorithm": "gcra", "timeout": 60, "request_limit": 2},
+    }
+    yield
+    local_deny_cache.clear()
+
+
+def _use_redis_cache(settings, location, pool_kwargs):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": location,
+            "OPTIONS": {"CONNECTION_POOL_KWARGS": pool_kwargs},
+        },
+    }
+    cache.clear()
+    local_deny_cache.clear()
+
+
+@pytest.fixture
+def fake_redis(settings):
+    _use_redis_cache(
+        settings,
+        "redis://localhost:6379/0",
+        {"connection_class": CountingFakeConnection, "server": FakeServer()},
+    )
+    yield
+    local_deny_cache.clear()
+
+
+@pytest.fixture
+def real_redis(settings):
+    location = os.environ.get("THROTTLE_BENCHMARK_REDIS_URL")
+    if not location:
+        pytest.skip("THROTTLE_BENCHMARK_REDIS_URL is not set")
+
+    _use_redis_cache(settings, location, {"connection_class": CountingConnection})
+    yield
+    cache.clear()
+    local_deny_cache.clear()
+
+
+def get_policy(engine: str, request_limit: int) -> dict:
+    return {
+        "algorithm": ENGINES[engine],
+        "timeout": 3600,
+        "request_limit": request_limit,
+        "shadow": False,
+    }
+
+
+def decide(ident: str, policy: dict, count: int) -> tuple[list[float], int]:
+    """
+    Runs `count` throttle decisions, returns their latencies and how many
+    were allowed
+    """
+    latencies = []
+    allowed = 0
+    throttle = AnonymousRequestThrottles()
+    for _ in range(count):
+        start = time.perf_counter()
+        allowed += throttle.evaluate(ident, policy)
+        latencies.append(time.perf_counter() - start)
+    return latencies, allowed
+
+
+def _decide_in_process(args):
+    RoundTrips.reset()
+    latencies, allowed = decide(*args)
+    return latencies, allowed, RoundTrips.count
+
+
+def run_concurrently(policy: dict, workers: int, count: int, *, processes=False):
+    """
+    Runs `count` decisions on each of `workers` threads or processes, all for
+    the same ident
+    """
+    RoundTrips.reset()
+    jobs = [("benchmark", policy, count)] * workers
+
+    start = time.perf_counter()
+    if processes:
+        context = multiprocessing.get_context("fork")
+        with context.Pool(workers) as pool:
+            results = pool.map(_decide_in_process, jobs)
+        round_trips = sum(result[2] for result in results)
+    else:
+        barrier = threading.Barrier(workers)
+
+        def run(job):
+            barrier.wait()
+            return decide(*job)
+
+        with ThreadPoolExecutor(workers) as executor:
+            results = list(executor.map(run, jobs))
+        round_trips = RoundTrips.count
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for result in results for latency in result[0])
+    decisions = workers * count
+    return {
+        "decisions": decisions,
+        "allowed": sum(result[1] for result in results),
+        "ops_per_sec": decisions / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "round_trips": round_trips / decisions,
+    }
+
+
+def make_user(tier: str):
+    if tier == "anonymous":
+        return None
+    return UserFactory(is_staff=tier == "staff", is_superuser=tier == "superuser")
+
+
+def call_view(user, action="list", **initkwargs):
+    request = APIRequestFactory().get("/books/")
+    if user is not None:
+        force_authenticate(request, user)
+    # As ATOMIC_REQUESTS does, errors roll the request back
+    with transaction.atomic():
+        # The router passes the permissions and throttles of the action
+        initkwargs = {
+            **getattr(getattr(BookViewSet, action), "kwargs", {}),
+            **initkwargs,
+        }
+        return BookViewSet.as_view({"get": action}, **initkwargs)(request)
+
+
+def get_stored_request_count(engine: str, policy: dict) -> int:
+    throttle_cache = get_throttle_algorithm(policy["algorithm"])(
+        "benchmark",
+        "anonymous",
+        timeout=policy["timeout"],
+        request_limit=policy["request_limit"],
+    )
+    if engine == "python":
+        return throttle_cache.throttle_data.request_count
+
+    data = throttle_cache.client.hgetall(cache.make_key(throttle_cache.cache_key))
+    return ThrottleInfo.from_hash(
+        {key.decode(): value for key, value in data.items()},
+    ).request_count
+
+
+@pytest.mark.parametrize("engine", ATOMIC_ENGINES)
+def test_concurrent_decisions_admit_exactly_the_limit(fake_redis, engine):
+    limit = 50
+    result = run_concurrently(get_policy(engine, limit), workers=16, count=25)
+
+    assert result["allowed"] == limit
+
+
+def test_concurrent_decisions_lose_no_increments(fake_redis):
+    # Nothing is throttled, so every decision reaches the script
+    policy = get_policy("escalating", 10_000)
+    run_concurrently(policy, workers=16, count=25)
+
+    assert get_stored_request_count("escalating", policy) == 16 * 25
+
+
+@pytest.mark.parametrize("engine", ATOMIC_ENGINES)
+def test_decision_is_a_single_round_trip(fake_redis, caplog, engine):
+    decide("warmup", get_policy(engine, 10_000), 1)
+    RoundTrips.reset()
+
+    count = 10
+    _, allowed = decide("benchmark", get_policy(engine, 10_000), count)
+
+    assert RoundTrips.count == count
+    assert allowed == count
+    # Failed decisions are allowed too, but logged
+    assert not [
+        record for record in caplog.records if record.levelno >= logging.WARNING
+    ]
+
+
+def test_gcra_allows_a_burst_of_the_limit(clock):
+    throttle_cache = GCRAThrottleCache("ident", "test", timeout=60, request_limit=5)
+
+    assert [throttle_cache.evaluate() for _ in range(6)] == [True] * 5 + [False]
+
+
+def test_gcra_allows_a_request_per_emission_interval_after_a_deny(clock):
+    throttle_cache = GCRAThrottleCache("ident", "test", timeout=60, request_limit=5)
+    for _ in range(5):
+        throttle_cache.evaluate()
+
+    assert not throttle_cache.evaluate()
+    assert throttle_cache.allow_request_after == pytest.approx(12)
+
+    clock.advance(11)
+    assert not throttle_cache.evaluate()
+    clock.advance(1)
+    assert throttle_cache.evaluate()
+    assert not throttle_cache.evaluate()
+
+
+def test_sliding_window_weighs_the_previous_window(clock):
+    throttle_cache = SlidingWindowThrottleCache(
+        "ident",
+        "test",
+        timeout=60,
+        request_limit=10,
+    )
+    assert all(throttle_cache.evaluate() for _ in range(10))
+
+    # A quarter into the next window, 3/4 of the previous one still count
+    clock.advance(75)
+    assert [throttle_cache.evaluate() for _ in range(3)] == [True, True, False]
+
+    # 18 seconds in, only 7 of them count
+    assert throttle_cache.allow_request_after == pytest.approx(3)
+    clock.advance(3)
+    assert throttle_cache.evaluate()
+    assert not throttle_cache.evaluate()
+
+
+def test_sliding_window_waits_for_a_full_window_to_slide(clock):
+    throttle_cache = SlidingWindowThrottleCache(
+        "ident",
+        "test",
+        timeout=60,
+        request_limit=10,
+    )
+    clock.advance(30)
+    assert all(throttle_cache.evaluate() for _ in range(10))
+
+    assert not throttle_cache.evaluate()
+    # 30 seconds until the next window, then 6 more until 9 of 10 count
+    assert throttle_cache.allow_request_after == pytest.approx(36)
+
+
+def test_legacy_throttle_data_is_migrated(fake_redis, clock):
+    throttle_cache = AtomicThrottleCache("ident", "test", timeout=60, request_limit=5)
+    # The JSON document older versions wrote through the cache client, once
+    # throttled already
+    legacy_data = ThrottleInfo(
+        previously_throttled=True,
+        request_count=4,
+        total_request_count=6,
+        total_times_throttled=1,
+        first_request_timestamp=clock().timestamp(),
+        throttled_timestamp=None,
+    )
+    cache.set(throttle_cache.cache_key, json.dumps(legacy_data.to_dict()), 180)
+
+    assert throttle_cache.evaluate()
+    key = cache.make_key(throttle_cache.cache_key)
+    assert throttle_cache.client.type(key) == b"hash"
+    assert throttle_cache.throttle_data.request_count == legacy_data.request_count + 1
+    assert (
+        throttle_cache.throttle_data.total_request_count
+        == legacy_data.total_request_count
+    )
+
+    # Throttled again, with the wait time of the second step of the ladder
+    assert not throttle_cache.evaluate()
+    assert throttle_cache.escalated
+    assert throttle_cache.allow_request_after == throttle_cache.throttle_wait_time[1]
+
+
+@pytest.mark.parametrize("engine", ATOMIC_ENGINES)
+def test_cost_uses_up_that_many_requests_of_the_limit(clock, engine):
+    cost = 10
+    throttle_cache = get_throttle_algorithm(engine)(
+        "ident",
+        "test",
+        timeout=60,
+        request_limit=cost * 2,
+    )
+
+    assert throttle_cache.evaluate(cost=cost)
+    assert throttle_cache.evaluate(cost=cost)
+    assert not throttle_cache.evaluate()
+
+
+@pytest.mark.django_db
+def test_action_throttle_cost_uses_up_the_scope_budget(settings, book_scopes, clock):
+    cost = 10
+    settings.THROTTLE_SCOPES = {
+        **settings.THROTTLE_SCOPES,
+        "trash": {"algorithm": "gcra", "timeout": 60, "request_limit": cost * 2},
+    }
+    user = make_user("superuser")
+
+    for _ in range(2):
+        response = call_view(user, "deleted", throttle_cost=cost)
+        assert response.status_code == status.HTTP_200_OK
+
+    response = call_view(user, "deleted")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@pytest.mark.django_db
+def test_view_releases_the_concurrency_slots(book_scopes):
+    request_limit = get_throttle_policy("concurrency", "anonymous")["request_limit"]
+
+    # Called without any middleware
+    for _ in range(request_limit * 2):
+        response = call_view(None, permission_classes=[AllowAny])
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_streaming_response_holds_the_concurrency_slot_until_closed(
+    settings,
+    book_scopes,
+):
+    settings.THROTTLE_SCOPES = {
+        **settings.THROTTLE_SCOPES,
+        "concurrency": {"timeout": 60, "request_limit": 1},
+    }
+    user = make_user("user")
+    request = APIRequestFactory().get("/books/deleted/", {"stream": "1"})
+    force_authenticate(request, user)
+    view = BookViewSet.as_view({"get": "deleted"}, permission_classes=[AllowAny])
+
+    response = view(request)
+    assert response.streaming
+    assert call_view(user).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    b"".join(response.streaming_content)
+    response.close()
+    assert call_view(user).status_code == status.HTTP_200_OK
+
+
+def test_local_concurrency_slots_expire(clock):
+    limiter = ConcurrencyLimiter("ident", "test", timeout=60, request_limit=1)
+    assert limiter.acquire()
+
+    other_limiter = ConcurrencyLimiter("ident", "test", timeout=60, request_limit=1)
+    assert not other_limiter.acquire()
+    clock.advance(60)
+    assert other_limiter.acquire()
+    other_limiter.release()
+
+
+def test_local_deny_cache_denies_until_release(clock):
+    deny_cache = LocalDenyCache()
+    release_at = clock().timestamp() + 10
+    deny_cache.add("anonymous_ident", release_at)
+
+    assert deny_cache.get("anonymous_ident") == release_at
+    clock.advance(10)
+    assert deny_cache.get("anonymous_ident") is None
+
+
+def test_local_deny_cache_evicts_the_least_recently_used(clock):
+    deny_cache = LocalDenyCache(max_size=2)
+    release_at = clock().timestamp() + 10
+    deny_cache.add("anonymous_first", release_at)
+    deny_cache.add("anonymous_second", release_at)
+    deny_cache.get("anonymous_first")
+    deny_cache.add("anonymous_third", release_at)
+
+    assert deny_cache.get("anonymous_second") is None
+    assert deny_cache.get("anonymous_first") == release_at
+    assert deny_cache.get("anonymous_third") == release_at
+
+
+def test_reset_throttle_clears_the_local_deny_caches(clock):
+    # The cache of another worker, checking the generation on every read
+    worker_deny_cache = LocalDenyCache(sync_interval=0)
+    release_at = clock().timestamp() + 10
+    worker_deny_cache.add("anonymous_ident", release_at)
+    local_deny_cache.add("anonymous_ident", release_at)
+
+    reset_throttle("anonymous", "ident")
+
+    assert local_deny_cache.get("anonymous_ident") is None
+    assert worker_deny_cache.get("anonymous_ident") is None
+
+
+def test_local_deny_cache_ignores_earlier_resets(clock):
+    reset_throttle("anonymous", "other")
+    deny_cache = LocalDenyCache(sync_interval=0)
+    release_at = clock().timestamp() + 10
+    deny_cache.add("anonymous_ident", release_at)
+
+    assert deny_cache.get("anonymous_ident") == release_at
+
+
+@pytest.mark.parametrize("shadow_mode", ["setting", "scope"])
+def test_shadow_mode_counts_denials_without_rejecting(
+    settings,
+    clock,
+    decision_counter,
+    shadow_mode,
+):
+    policy = {"algorithm": "gcra", "timeout": 60, "request_limit": 5}
+    if shadow_mode == "setting":
+        settings.THROTTLE_SHADOW_MODE = True
+    else:
+        policy["shadow"] = True
+    settings.THROTTLE_SCOPES = {**settings.THROTTLE_SCOPES, "anonymous": policy}
+    throttle = AnonymousRequestThrottles()
+
+    assert all(throttle.evaluate("ident") for _ in range(policy["request_limit"] + 1))
+    assert local_deny_cache.get("anonymous_ident") is None
+
+    decision_counter.flush()
+    assert get_throttle_decision_counts("anonymous") == {
+        "allowed": policy["request_limit"],
+        "throttled": 1,
+        "escalated": 0,
+    }
+
+
+def test_decision_counts_are_written_in_a_single_batch(fake_redis, decision_counter):
+    decisions = [("anonymous", "allowed")] * 3 + [
+        ("anonymous", "throttled"),
+        ("trash", "allowed"),
+    ]
+
+    RoundTrips.reset()
+    for scope, decision in decisions:
+        decision_counter.increment(scope, decision)
+    assert RoundTrips.count == 0
+    assert get_throttle_decision_counts("anonymous")["allowed"] == 0
+
+    RoundTrips.reset()
+    decision_counter.flush()
+    assert RoundTrips.count == 1
+    assert get_throttle_decision_counts("anonymous") == {
+        "allowed": 3,
+        "throttled": 1,
+        "escalated": 0,
+    }
+    assert get_throttle_decision_counts("trash")["allowed"] == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ("tier", "algorithm", "request_limit"),
+    [
+        ("anonymous", "gcra", 2),
+        ("user", "gcra", 3),
+        ("staff", "sliding_window", 4),
+    ],
+)
+def test_scoped_throttle_applies_the_policy_of_the_tier(
+    book_scopes,
+    clock,
+    tier,
+    algorithm,
+    request_limit,
+):
+    user = make_user(tier)
+    assert get_user_tier(user) == tier
+    policy = get_throttle_policy("books", tier)
+    assert policy["algorithm"] == algorithm
+    assert policy["request_limit"] == request_limit
+    assert policy["timeout"] == TIERED_POLICY["timeout"]
+
+    responses = [
+        call_view(user, throttle_scope="books", permission_classes=[AllowAny])
+        for _ in range(request_limit + 1)
+    ]
+
+    assert [response.status_code for response in responses] == [
+        *[status.HTTP_200_OK] * request_limit,
+        status.HTTP_429_TOO_MANY_REQUESTS,
+    ]
+
+
+@pytest.mark.django_db
+def test_scoped_throttle_skips_a_tier_set_to_none(book_scopes):
+    user = make_user("superuser")
+    assert get_throttle_policy("books", "superuser") is None
+
+    for _ in range(TIERED_POLICY["request_limit"] * 2):
+        response = call_view(user, throttle_scope="books")
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_action_throttle_scope_applies_to_the_action_only(book_scopes, clock):
+    user = make_user("superuser")
+    request_limit = get_throttle_policy("trash", "superuser")["request_limit"]
+
+    for _ in range(request_limit):
+        assert call_view(user, "deleted").status_code == status.HTTP_200_OK
+
+    response = call_view(user, "deleted")
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert call_view(user, "list").status_code == status.HTTP_200_OK
+
+
+def report(name: str, result: dict, request_limit: int, lost: int | None = None):
+    print(  # noqa: T201
+        f"{name:<36} {result['ops_per_sec']:>10.0f} ops/s"
+        f"  p50 {result['p50_ms']:>7.3f} ms  p99 {result['p99_ms']:>7.3f} ms"
+        f"  {result['round_trips']:>5.2f} round trips"
+        f"  {max(result['allowed'] - request_limit, 0):>5} over-admitted"
+        + (f"  {lost:>5} lost" if lost is not None else ""),
+    )
+
+
+def _benchmark(engine: str, workers: int, count: int, *, processes=False):
+    # Throttled decisions after the first 100 are mostly local deny cache hits
+    result = run_concurrently(
+        get_policy(engine, 100),
+        workers,
+        count,
+        processes=processes,
+    )
+    report(f"{engine} {workers} {'processes' if processes else 'threads'}", result, 100)
+
+    if engine in ("python", "escalating"):
+        cache.clear()
+        local_deny_cache.clear()
+        policy = get_policy(engine, 10**9)
+        result = run_concurrently(policy, workers, count, processes=processes)
+        lost = workers * count - get_stored_request_count(engine, policy)
+        report(
+            f"{engine} {workers} {'processes' if processes else 'threads'} unthrottled",
+            result,
+            policy["request_limit"],
+            lost,
+        )
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("workers", [1, 8, 32])
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_benchmark_threads(fake_redis, engine, workers):
+    _benchmark(engine, workers, 2_000 // workers)
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("workers", [1, 8])
+@pytest.mark.parametrize("engine", list(ENGINES))
+def test_benchmark_processes(real_redis, engine, workers):
+    _benchmark(engine, workers, 2_000 // workers, processes=True)
@@ -0,0 +1,120 @@
+"""
+Correctness tests and micro benchmark of the per view opt-out of ATOMIC_REQUESTS.
+
+The views are run through the request handler's `make_view_atomic`, as Django
+does. The benchmark is excluded by default, run it with:
+
+    pytest -m benchmark -s {{ cookiecutter.project_slug }}/base/tests/test_transactions.py
+
+It reports the p50/p99 latency of a single query GET with and without the
+request transaction. On PostgreSQL the difference is the BEGIN and COMMIT
+round trips.
+"""
+
+import statistics
+import time
+
+import pytest
+from django.contrib.auth.models import Group
+from django.core.handlers.base import BaseHandler
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from {{ cookiecutter.project_slug }}.base.transactions import atomic_operation
+from {{ cookiecutter.project_slug }}.base.transactions import non_atomic_safe_requests
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def in_atomic_block_view(request):
+    return HttpResponse(str(connection.in_atomic_block))
+
+
+def failing_write_view(request):
+    Group.objects.create(name="rolled back")
+    msg = "Write failed"
+    raise ValueError(msg)
+
+
+def read_view(request):
+    return HttpResponse(str(Group.objects.filter(name="benchmark").exists()))
+
+
+def get_response(view, method: str) -> HttpResponse:
+    request = RequestFactory().generic(method, "/")
+    return BaseHandler().make_view_atomic(view)(request)
+
+
+def test_requests_are_atomic_by_default():
+    assert connection.settings_dict["ATOMIC_REQUESTS"]
+    assert get_response(in_atomic_block_view, "GET").content == b"True"
+
+
+@pytest.mark.parametrize("method", ["GET", "HEAD", "OPTIONS"])
+def test_safe_requests_skip_the_transaction(method):
+    assert (
+        get_response(non_atomic_safe_requests(in_atomic_block_view), method).content
+        == b"False"
+    )
+
+
+@pytest.mark.parametrize("method", ["POST", "PUT", "PATCH", "DELETE"])
+def test_writes_stay_atomic(method):
+    assert (
+        get_response(non_atomic_safe_requests(in_atomic_block_view), method).content
+        == b"True"
+    )
+
+
+def test_failed_writes_roll_back():
+    with pytest.raises(ValueError, match="Write failed"):
+        get_response(non_atomic_safe_requests(failing_write_view), "POST")
+
+    assert not Group.objects.exists()
+
+
+@pytest.mark.parametrize(
+    ("method", "marked", "atomic"),
+    [
+        ("GET", False, b"True"),
+        ("GET", True, b"False"),
+        ("POST", True, b"True"),
+    ],
+)
+def test_atomic_operation(method, marked, atomic):
+    request = RequestFactory().generic(method, "/")
+    if marked:
+        request.non_atomic_safe_requests = True
+
+    assert atomic_operation(in_atomic_block_view)(request).content == atomic
+
+
+def measure(view, count: int) -> list[float]:
+    handler_view = BaseHandler().make_view_atomic(view)
+    request = RequestFactory().get("/")
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        handler_view(request)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies: list[float]):
+    quantiles = statistics.quantiles(latencies, n=100)
+    p50, p99 = quantiles[49] * 1000, quantiles[98] * 1000
+    print(f"{name:<24} p50 {p50:>7.3f} ms  p99 {p99:>7.3f} ms")  # noqa: T201
+
+
+@pytest.mark.benchmark
+def test_benchmark_safe_requests():
+    views = {
+        "atomic GET": read_view,
+        "non atomic GET": non_atomic_safe_requests(read_view),
+    }
+    for view in views.values():
+        measure(view, 100)
+
+    for name, view in views.items():
+        report(name, measure(view, 2_000))
@@ -0,0 +1,125 @@
+import pytest
+{%- if cookiecutter.use_celery == 'y' %}
+from celery.result import EagerResult
+{%- endif %}
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+{% if cookiecutter.use_celery == 'y' -%}
+from {{ cookiecutter.project_slug }}.base.tasks import run_trash_job_task
+{% endif -%}
+from {{ cookiecutter.project_slug }}.base.tests.factories import BookFactory
+from {{ cookiecutter.project_slug }}.base.tests.models import Book
+from {{ cookiecutter.project_slug }}.base.trash import DONE
+from {{ cookiecutter.project_slug }}.base.trash import EMPTY_TRASH
+from {{ cookiecutter.project_slug }}.base.trash import FAILED
+from {{ cookiecutter.project_slug }}.base.trash import RESTORE_ALL
+from {{ cookiecutter.project_slug }}.base.trash import create_trash_job
+from {{ cookiecutter.project_slug }}.base.trash import get_trash_job
+from {{ cookiecutter.project_slug }}.base.trash import run_trash_job
+
+pytestmark = pytest.mark.django_db
+
+
+class TitleRestoringViewSet:
+    """
+    Stands in for a viewset overriding `restore_queryset`
+    """
+
+    restored_batches: list[int] = []
+
+    def restore_queryset(self, queryset):
+        self.restored_batches.append(queryset.count())
+        queryset.update(is_deleted=False, title="Restored")
+
+
+@pytest.fixture
+def books():
+    """
+    Two live books and five deleted ones, one of them locked
+    """
+    BookFactory.create_batch(2)
+    BookFactory.create_batch(4, is_deleted=True)
+    BookFactory(is_deleted=True, locked=True)
+
+
+def test_empty_trash_runs_in_batches(books):
+    job = create_trash_job(Book, EMPTY_TRASH)
+
+    with CaptureQueriesContext(connection) as queries:
+        job = run_trash_job(job["id"], batch_size=2)
+
+    # A transaction per batch of at most two rows
+    transactions = [query for query in queries if query["sql"].startswith("SAVEPOINT")]
+    assert len(transactions) == 3  # noqa: PLR2004
+    assert job["status"] == DONE
+    assert (job["total"], job["processed"], job["affected"]) == (5, 5, 4)
+    assert get_trash_job(job["id"]) == job
+    # Locked rows are skipped
+    rows = Book.objects.all_objects().values_list("is_deleted", "locked")
+    assert sorted(rows) == [(False, False), (False, False), (True, True)]
+
+
+def test_restore_all_runs_in_batches(books):
+    job = run_trash_job(create_trash_job(Book, RESTORE_ALL)["id"], batch_size=2)
+
+    assert job["status"] == DONE
+    assert (job["processed"], job["affected"]) == (5, 5)
+    assert not Book.objects.deleted().exists()
+
+
+def test_restore_all_calls_the_restore_queryset_of_the_viewset(books, monkeypatch):
+    monkeypatch.setattr(TitleRestoringViewSet, "restored_batches", [])
+    job = create_trash_job(
+        Book,
+        RESTORE_ALL,
+        viewset=f"{__name__}.{TitleRestoringViewSet.__qualname__}",
+    )
+
+    job = run_trash_job(job["id"], batch_size=2)
+
+    assert TitleRestoringViewSet.restored_batches == [2, 2, 1]
+    assert (job["processed"], job["affected"]) == (5, 5)
+    assert Book.objects.filter(title="Restored").count() == job["affected"]
+
+
+def test_jobs_run_once(books):
+    job = create_trash_job(Book, RESTORE_ALL)
+    run_trash_job(job["id"])
+    BookFactory(is_deleted=True)
+
+    assert run_trash_job(job["id"])["processed"] == 5  # noqa: PLR2004
+    assert Book.objects.deleted().count() == 1
+
+
+def test_failed_job_keeps_its_error(books, monkeypatch):
+    def hard_delete(queryset):
+        msg = "Database is gone"
+        raise RuntimeError(msg)
+
+    monkeypatch.setattr(type(Book.objects.all_objects()), "hard_delete", hard_delete)
+    job = create_trash_job(Book, EMPTY_TRASH)
+
+    with pytest.raises(RuntimeError):
+        run_trash_job(job["id"])
+
+    job = get_trash_job(job["id"])
+    assert (job["status"], job["error"]) == (FAILED, "Database is gone")
+    assert Book.objects.deleted().count() == 5  # noqa: PLR2004
+
+
+def test_expired_job_is_ignored():
+    assert run_trash_job("0" * 32) is None
+{%- if cookiecutter.use_celery == 'y' %}
+
+
+def test_run_trash_job_task(books, settings):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    job = create_trash_job(Book, RESTORE_ALL)
+
+    task_result = run_trash_job_task.delay(job["id"])
+
+    assert isinstance(task_result, EagerResult)
+    assert task_result.result == DONE
+    assert not Book.objects.deleted().exists()
+{%- endif %}
@@ -0,0 +1,160 @@
+import json
+from urllib.parse import parse_qsl
+from urllib.parse import urlsplit
+
+import pytest
+from django.db import connections
+from django.db import transaction
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from rest_framework.test import force_authenticate
+
+from {{ cookiecutter.project_slug }}.base.tests.factories import BookFactory
+from {{ cookiecutter.project_slug }}.base.tests.models import Book
+from {{ cookiecutter.project_slug }}.base.tests.views import BookViewSet
+from {{ cookiecutter.project_slug }}.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def superuser():
+    return UserFactory(is_superuser=True)
+
+
+def call(user, method, action, data=None, **kwargs):
+    request = getattr(APIRequestFactory(), method)("/books/", data)
+    force_authenticate(request, user)
+    # As ATOMIC_REQUESTS does, errors roll the request back
+    with transaction.atomic():
+        # The router passes the permissions and throttles of the action
+        initkwargs = getattr(BookViewSet, action).kwargs
+        view = BookViewSet.as_view({method: action}, **initkwargs)
+        return view(request, **kwargs)
+
+
+def get_expected_pks(books) -> list[int]:
+    # In the `-created_at`, `-pk` ordering of the pagination
+    return [
+        book.pk
+        for book in sorted(books, key=lambda book: (book.created_at, book.pk))[::-1]
+    ]
+
+
+def test_deleted_objects_are_paginated(superuser):
+    deleted = BookFactory.create_batch(5, is_deleted=True)
+    BookFactory.create_batch(2)
+    page_size = 2
+
+    pages = []
+    data = {"limit": page_size}
+    while data:
+        response = call(superuser, "get", "deleted", data)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append([book["id"] for book in response.data["results"]])
+        next_link = response.data["next"]
+        data = next_link and dict(parse_qsl(urlsplit(next_link).query))
+
+    expected = get_expected_pks(deleted)
+    assert pages == [
+        expected[index : index + page_size]
+        for index in range(0, len(expected), page_size)
+    ]
+
+
+def test_deleted_objects_are_streamed(superuser):
+    deleted = BookFactory.create_batch(5, is_deleted=True)
+    BookFactory.create_batch(2)
+
+    response = call(superuser, "get", "deleted", {"stream": "1", "limit": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    assert response["Content-Type"] == "application/json"
+    books = json.loads(b"".join(response.streaming_content))
+    response.close()
+    assert [book["id"] for book in books] == get_expected_pks(deleted)
+
+
+def test_deleted_objects_are_for_superusers(user):
+    BookFactory(is_deleted=True)
+
+    response = call(user, "get", "deleted")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.parametrize(
+    ("action", "remaining"),
+    [("empty_trash", 0), ("restore_all", 3)],
+)
+{%- if cookiecutter.use_celery == 'y' %}
+def test_trash_job_runs_in_the_background(
+    superuser,
+    settings,
+    django_capture_on_commit_callbacks,
+    action,
+    remaining,
+):
+    settings.CELERY_TASK_ALWAYS_EAGER = True
+    BookFactory.create_batch(3, is_deleted=True)
+
+    # The task is enqueued once the request commits
+    with django_capture_on_commit_callbacks(execute=True):
+        response = call(superuser, "post", action)
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.data["status"] == "pending"
+{%- else %}
+def test_trash_job_runs_inline(superuser, action, remaining):
+    BookFactory.create_batch(3, is_deleted=True)
+
+    response = call(superuser, "post", action)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["status"] == "done"
+{%- endif %}
+    assert Book.objects.all_objects().count() == remaining
+    assert not Book.objects.deleted().exists()
+
+    response = call(superuser, "get", "trash_job", job_id=response.data["id"])
+
+    assert response.status_code == status.HTTP_200_OK
+    assert (response.data["status"], response.data["processed"]) == ("done", 3)
+
+
+@pytest.mark.parametrize("action", ["empty_trash", "restore_all"])
+def test_trash_jobs_are_for_superusers(user, action):
+    BookFactory(is_deleted=True)
+
+    response = call(user, "post", action)
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert Book.objects.deleted().exists()
+
+
+def test_restore_all_without_deleted_objects(superuser):
+    BookFactory()
+
+    response = call(superuser, "post", "restore_all")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_unknown_trash_job_is_not_found(superuser):
+    response = call(superuser, "get", "trash_job", job_id="0" * 32)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    ("action", "atomic"),
+    [("empty_trash", False), ("restore_all", False), ("trash_job", True)],
+)
+def test_trash_jobs_run_outside_the_request_transaction(action, atomic):
+    initkwargs = getattr(BookViewSet, action).kwargs
+    view = BookViewSet.as_view({"post": action}, **initkwargs)
+
+    # Django skips ATOMIC_REQUESTS for these databases
+    non_atomic = getattr(view, "_non_atomic_requests", set())
+    assert non_atomic == (set() if atomic else set(connections.settings))
@@ -0,0 +1,15 @@
+from {{ cookiecutter.project_slug }}.base.api.serializers import BaseModelSerializer
+from {{ cookiecutter.project_slug }}.base.api.views import BaseModelViewSet
+from {{ cookiecutter.project_slug }}.base.tests.models import Book
+
+
+class BookSerializer(BaseModelSerializer):
+    class Meta(BaseModelSerializer.Meta):
+        model = Book
+        fields = (*BaseModelSerializer.Meta.fields, "title", "author")
+
+
+class BookViewSet(BaseModelViewSet):
+    model = Book
+    queryset = Book.objects.all()
+    serializer_class = BookSerializer
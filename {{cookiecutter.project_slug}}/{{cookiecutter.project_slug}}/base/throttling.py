@@ -1,14 +1,49 @@
+import atexit
 import json
+import math
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, defaultdict
 from dataclasses import dataclass
+from typing import Self
 import logging
 
+from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
+from django.utils.module_loading import import_string
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
 from rest_framework.throttling import BaseThrottle
 
 logger = logging.getLogger(__name__)
 
 
+def get_redis_client():
+    """
+    Returns the raw redis client behind the default cache, or `None` if the
+    cache is not backed by redis (e.g. locmem cache in tests).
+    """
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
+
+
+_registered_scripts = {}
+
+
+def run_redis_script(client, source: str, keys: list, args: list):
+    """
+    Runs a lua script with EVALSHA, registering it once per process
+    """
+    script = _registered_scripts.get(source)
+    if script is None:
+        script = _registered_scripts[source] = client.register_script(source)
+    return script(keys=keys, args=args, client=client)
+
+
 @dataclass
 class ThrottleInfo:
     previously_throttled: bool
@@ -51,6 +86,54 @@ class ThrottleInfo:
             "throttled_timestamp": self.throttled_timestamp,
         }
 
+    @classmethod
+    def from_hash(cls, data: dict) -> Self:
+        """
+        Builds the info from the compact hash format. Values may be the raw
+        bytes returned by redis.
+        """
+
+        def to_float(value):
+            return float(value) if value not in (None, "", b"") else None
+
+        return cls(
+            previously_throttled=int(data.get("p") or 0) == 1,
+            request_count=int(data.get("c") or 0),
+            total_request_count=int(data.get("tc") or 0),
+            total_times_throttled=int(data.get("tt") or 0),
+            first_request_timestamp=to_float(data.get("f")),
+            throttled_timestamp=to_float(data.get("t")),
+        )
+
+    def to_hash(self) -> dict:
+        """
+        Compact representation stored in cache, with short field names and
+        without the empty timestamps
+        """
+        data = {
+            "p": int(self.previously_throttled),
+            "c": self.request_count,
+            "tc": self.total_request_count,
+            "tt": self.total_times_throttled,
+        }
+        if self.first_request_timestamp is not None:
+            data["f"] = self.first_request_timestamp
+        if self.throttled_timestamp is not None:
+            data["t"] = self.throttled_timestamp
+        return data
+
+    @classmethod
+    def from_cache_value(cls, value) -> Self:
+        """
+        Builds the info from whatever is stored in cache, including the JSON
+        documents written by older versions
+        """
+        if not value:
+            return cls.from_dict({})
+        if isinstance(value, (str, bytes)):
+            return cls.from_dict(json.loads(value))
+        return cls.from_hash(value)
+
 
 class ThrottleCache:
     # throttle_wait_time = [5, 10, 20, 40, 80]
@@ -67,30 +150,25 @@ class ThrottleCache:
         """
         Get the throttle data from cache
         """
-        data = cache.get(self.cache_key)
-        if not data:
-            return ThrottleInfo(
-                previously_throttled=False,
-                request_count=0,
-                total_request_count=0,
-                total_times_throttled=0,
-                first_request_timestamp=None,
-                throttled_timestamp=None,
-            )
-
-        return ThrottleInfo.from_dict(json.loads(data))
+        return ThrottleInfo.from_cache_value(cache.get(self.cache_key))
 
     def _update_data_to_cache(self):
         """
         Update the throttle data to cache
         """
-        logger.info("Updating throttle data to cache for %s", self.cache_key)
+        logger.debug("Updating throttle data to cache for %s", self.cache_key)
         cache.set(
             self.cache_key,
-            json.dumps(self.throttle_data.to_dict()),
+            self.throttle_data.to_hash(),
             self.timeout + self.wait_time,
         )
 
+    def reset(self):
+        """
+        Forget everything about the ident
+        """
+        cache.delete(self.cache_key)
+
     def reset_throttle_data(self):
         """
         Reset the throttle data
@@ -103,23 +181,26 @@ class ThrottleCache:
         self.throttle_data.throttled_timestamp = None
         self._update_data_to_cache()
 
-    def register_request(self):
+    def register_request(self, cost=1):
         """
         Register the request in cache
         """
-        logger.info("Registering request for %s", self.cache_key)
-        self.throttle_data.request_count += 1
+        logger.debug("Registering request for %s", self.cache_key)
+        self.throttle_data.request_count += cost
 
         if not self.throttle_data.first_request_timestamp:
             self.throttle_data.first_request_timestamp = timezone.now().timestamp()
 
         self._update_data_to_cache()
 
-    def should_throttle_request(self):
+    def should_throttle_request(self, cost=1):
         """
         Check if the request should be throttled
         """
-        request_limit_reached = self.throttle_data.request_count >= self.request_limit
+        request_limit_reached = (
+            self.throttle_data.throttled_timestamp is not None
+            or self.throttle_data.request_count + cost > self.request_limit
+        )
 
         if request_limit_reached and not self.throttle_data.throttled_timestamp:
             self.throttle_data.throttled_timestamp = timezone.now().timestamp()
@@ -136,6 +217,30 @@ class ThrottleCache:
 
         return request_limit_reached
 
+    def evaluate(self, *, is_authenticated=False, cost=1) -> bool:
+        """
+        Register the request and decide whether it should be allowed.
+        A request uses up `cost` of the `request_limit`.
+        """
+        should_throttle_request = self.should_throttle_request(cost)
+
+        self.register_request(cost)
+
+        if (
+            should_throttle_request and self.allow_request_after < 0
+        ) or is_authenticated:
+            self.reset_throttle_data()
+            return True
+
+        return not should_throttle_request
+
+    @property
+    def escalated(self) -> bool:
+        """
+        Whether the ident has been throttled before, so its wait time grows
+        """
+        return self.throttle_data.previously_throttled
+
     @property
     def wait_time(self):
         """
@@ -163,26 +268,910 @@ class ThrottleCache:
         )
 
 
+class AtomicThrottleCache(ThrottleCache):
+    """
+    Same escalating fixed window as `ThrottleCache`, but the read, increment,
+    decision and write are done by a single redis script call. This removes the
+    extra round trips and the lost increments of concurrent read-modify-write.
+
+    The data is kept in a small redis hash (see `ThrottleInfo.to_hash`), so
+    nothing is encoded or decoded on the request path. JSON documents written
+    by older versions are converted the first time they are read.
+
+    Falls back to `ThrottleCache` when the cache is not backed by redis.
+    """
+
+    script_source = """
+    if redis.call("TYPE", KEYS[1])["ok"] == "string" then
+        return {-1}
+    end
+
+    local now = tonumber(ARGV[1])
+    local request_limit = tonumber(ARGV[2])
+    local timeout = tonumber(ARGV[3])
+    local is_authenticated = ARGV[4] == "1"
+    local cost = tonumber(ARGV[5])
+    local throttle_wait_time = {}
+    for index = 6, #ARGV do
+        throttle_wait_time[#throttle_wait_time + 1] = tonumber(ARGV[index])
+    end
+
+    local function wait_time(total_times_throttled)
+        local index = math.min(total_times_throttled + 1, #throttle_wait_time)
+        return throttle_wait_time[index]
+    end
+
+    local data = redis.call("HMGET", KEYS[1], "p", "c", "tc", "tt", "f", "t")
+    local previously_throttled = data[1] == "1"
+    local request_count = tonumber(data[2]) or 0
+    local total_request_count = tonumber(data[3]) or 0
+    local total_times_throttled = tonumber(data[4]) or 0
+    local first_request_timestamp = data[5] or ""
+    local throttled_timestamp = data[6] or ""
+
+    local request_limit_reached = throttled_timestamp ~= ""
+        or request_count + cost > request_limit
+    if request_limit_reached and throttled_timestamp == "" then
+        throttled_timestamp = ARGV[1]
+        redis.call("HSET", KEYS[1], "t", throttled_timestamp)
+    end
+
+    request_count = redis.call("HINCRBY", KEYS[1], "c", cost)
+    if first_request_timestamp == "" then
+        first_request_timestamp = ARGV[1]
+        redis.call("HSET", KEYS[1], "f", first_request_timestamp)
+    end
+
+    local allowed = 1
+    if request_limit_reached then
+        allowed = 0
+    end
+    local allow_request_after = 0
+    if throttled_timestamp ~= "" then
+        allow_request_after = tonumber(throttled_timestamp)
+            + wait_time(total_times_throttled) - now
+    end
+
+    if (request_limit_reached and allow_request_after < 0) or is_authenticated then
+        total_request_count = redis.call("HINCRBY", KEYS[1], "tc", request_count)
+        total_times_throttled = redis.call("HINCRBY", KEYS[1], "tt", 1)
+        request_count = 0
+        previously_throttled = true
+        first_request_timestamp = ""
+        throttled_timestamp = ""
+        redis.call("HSET", KEYS[1], "c", 0, "p", 1)
+        redis.call("HDEL", KEYS[1], "f", "t")
+        allowed = 1
+    end
+
+    redis.call("EXPIRE", KEYS[1], math.ceil(timeout + wait_time(total_times_throttled)))
+
+    local previously_throttled_flag = 0
+    if previously_throttled then
+        previously_throttled_flag = 1
+    end
+    return {
+        allowed,
+        previously_throttled_flag,
+        request_count,
+        total_request_count,
+        total_times_throttled,
+        first_request_timestamp,
+        throttled_timestamp,
+    }
+    """
+
+    def __init__(self, ident: str, cache_scope: str, timeout=60, request_limit=5):
+        self.client = get_redis_client()
+        super().__init__(ident, cache_scope, timeout, request_limit)
+
+    def _get_data_from_cache(self) -> ThrottleInfo:
+        """
+        The data is read by the script itself, so there is nothing to fetch
+        upfront unless we are falling back to `ThrottleCache`
+        """
+        if self.client is None:
+            return super()._get_data_from_cache()
+
+        return ThrottleInfo.from_dict({})
+
+    def _migrate_legacy_data(self, key: str):
+        """
+        Convert the JSON document stored by older versions into a hash
+        """
+        raw = self.client.get(key)
+        try:
+            throttle_data = ThrottleInfo.from_dict(json.loads(raw))
+        except TypeError, ValueError:
+            # Written through the cache client, so it is pickled
+            throttle_data = ThrottleInfo.from_cache_value(cache.get(self.cache_key))
+
+        logger.info("Migrating legacy throttle data for %s", self.cache_key)
+        pipeline = self.client.pipeline()
+        pipeline.delete(key)
+        pipeline.hset(key, mapping=throttle_data.to_hash())
+        pipeline.expire(key, self.timeout + self.throttle_wait_time[-1])
+        pipeline.execute()
+
+    def evaluate(self, *, is_authenticated=False, cost=1) -> bool:
+        if self.client is None:
+            return super().evaluate(is_authenticated=is_authenticated, cost=cost)
+
+        key = cache.make_key(self.cache_key)
+        args = [
+            timezone.now().timestamp(),
+            self.request_limit,
+            self.timeout,
+            int(is_authenticated),
+            cost,
+            *self.throttle_wait_time,
+        ]
+        result = run_redis_script(self.client, self.script_source, [key], args)
+        if result[0] == -1:
+            self._migrate_legacy_data(key)
+            result = run_redis_script(self.client, self.script_source, [key], args)
+
+        allowed, *data = result
+        self.throttle_data = ThrottleInfo.from_hash(
+            dict(zip(("p", "c", "tc", "tt", "f", "t"), data, strict=True)),
+        )
+
+        if not allowed:
+            self.should_throttle_request(cost)
+
+        return bool(allowed)
+
+
+class GCRAThrottleCache:
+    """
+    Generic cell rate algorithm. Spreads `request_limit` requests evenly over
+    `timeout` seconds (with a burst of up to `request_limit`) and stores a
+    single float per ident: the theoretical arrival time of the next request.
+    A request with a `cost` takes as many emission intervals.
+    """
+
+    script_source = """
+    local now = tonumber(ARGV[1])
+    local increment = tonumber(ARGV[2])
+    local timeout = tonumber(ARGV[3])
+
+    local theoretical_arrival_time = tonumber(redis.call("GET", KEYS[1])) or now
+    if theoretical_arrival_time < now then
+        theoretical_arrival_time = now
+    end
+
+    local new_theoretical_arrival_time = theoretical_arrival_time + increment
+    local allow_at = new_theoretical_arrival_time - timeout
+    if allow_at > now then
+        return {0, tostring(allow_at - now)}
+    end
+
+    redis.call(
+        "SET",
+        KEYS[1],
+        tostring(new_theoretical_arrival_time),
+        "PX",
+        math.ceil((new_theoretical_arrival_time - now) * 1000)
+    )
+    return {1, "0"}
+    """
+
+    def __init__(self, ident: str, cache_scope: str, timeout=60, request_limit=5):
+        self.ident = ident
+        self.cache_key = f"throttle_gcra_{cache_scope}_{ident}"
+        self.timeout = timeout
+        self.request_limit = request_limit
+        self.client = get_redis_client()
+        self.allow_request_after = 0
+
+    @property
+    def emission_interval(self):
+        return self.timeout / self.request_limit
+
+    def reset(self):
+        cache.delete(self.cache_key)
+
+    def _evaluate_locally(self, now: float, cost: int) -> bool:
+        theoretical_arrival_time = max(cache.get(self.cache_key) or now, now)
+        new_theoretical_arrival_time = (
+            theoretical_arrival_time + self.emission_interval * cost
+        )
+        allow_at = new_theoretical_arrival_time - self.timeout
+
+        if allow_at > now:
+            self.allow_request_after = allow_at - now
+            return False
+
+        cache.set(
+            self.cache_key,
+            new_theoretical_arrival_time,
+            math.ceil(new_theoretical_arrival_time - now),
+        )
+        return True
+
+    def evaluate(self, *, is_authenticated=False, cost=1) -> bool:
+        if is_authenticated:
+            return True
+
+        now = timezone.now().timestamp()
+
+        if self.client is None:
+            return self._evaluate_locally(now, cost)
+
+        allowed, allow_request_after = run_redis_script(
+            self.client,
+            self.script_source,
+            keys=[cache.make_key(self.cache_key)],
+            args=[now, self.emission_interval * cost, self.timeout],
+        )
+        self.allow_request_after = float(allow_request_after)
+        return bool(allowed)
+
+
+class SlidingWindowThrottleCache:
+    """
+    Sliding window counter. Keeps one counter per fixed window and weighs the
+    previous window by how much of it still overlaps the sliding window, which
+    smooths out the bursts a fixed window allows at its edges.
+    """
+
+    script_source = """
+    local elapsed = tonumber(ARGV[1])
+    local timeout = tonumber(ARGV[2])
+    local request_limit = tonumber(ARGV[3])
+    local cost = tonumber(ARGV[4])
+
+    local current_count = tonumber(redis.call("GET", KEYS[1])) or 0
+    local previous_count = tonumber(redis.call("GET", KEYS[2])) or 0
+
+    local estimated_count = previous_count * (1 - elapsed / timeout) + current_count
+    if estimated_count + cost > request_limit then
+        return {0, current_count, previous_count}
+    end
+
+    current_count = redis.call("INCRBY", KEYS[1], cost)
+    redis.call("EXPIRE", KEYS[1], timeout * 2)
+    return {1, current_count, previous_count}
+    """
+
+    def __init__(self, ident: str, cache_scope: str, timeout=60, request_limit=5):
+        self.ident = ident
+        self.cache_key = f"throttle_sliding_{cache_scope}_{ident}"
+        self.timeout = timeout
+        self.request_limit = request_limit
+        self.client = get_redis_client()
+        self.allow_request_after = 0
+
+    def _get_wait_time(self, current_count, previous_count, elapsed, cost=1):
+        """
+        Time until the estimated count leaves room for a request of `cost`
+        """
+        available = self.request_limit - cost - current_count
+        if available >= 0 and previous_count:
+            return max(self.timeout * (1 - available / previous_count) - elapsed, 0)
+
+        # The current window alone is full, wait for it to become the previous one
+        wait = self.timeout - elapsed
+        if current_count:
+            wait += max(
+                self.timeout * (1 - (self.request_limit - cost) / current_count),
+                0,
+            )
+        return wait
+
+    def _get_window(self, now: float):
+        """
+        Returns the time elapsed in the current window and the keys of the
+        current and previous window counters
+        """
+        window = int(now // self.timeout)
+        elapsed = now - window * self.timeout
+        return elapsed, f"{self.cache_key}_{window}", f"{self.cache_key}_{window - 1}"
+
+    def reset(self):
+        _, current_key, previous_key = self._get_window(timezone.now().timestamp())
+        cache.delete_many([current_key, previous_key])
+
+    def evaluate(self, *, is_authenticated=False, cost=1) -> bool:
+        if is_authenticated:
+            return True
+
+        now = timezone.now().timestamp()
+        elapsed, current_key, previous_key = self._get_window(now)
+
+        if self.client is None:
+            counts = cache.get_many([current_key, previous_key])
+            current_count = counts.get(current_key, 0)
+            previous_count = counts.get(previous_key, 0)
+            estimated_count = (
+                previous_count * (1 - elapsed / self.timeout) + current_count
+            )
+            allowed = estimated_count + cost <= self.request_limit
+            if allowed:
+                cache.add(current_key, 0, self.timeout * 2)
+                cache.incr(current_key, cost)
+        else:
+            allowed, current_count, previous_count = run_redis_script(
+                self.client,
+                self.script_source,
+                keys=[cache.make_key(current_key), cache.make_key(previous_key)],
+                args=[elapsed, self.timeout, self.request_limit, cost],
+            )
+
+        if not allowed:
+            self.allow_request_after = self._get_wait_time(
+                current_count,
+                previous_count,
+                elapsed,
+                cost,
+            )
+
+        return bool(allowed)
+
+
+class ConcurrencyLimiter:
+    """
+    Counting semaphore of the in-flight requests of an ident, allowing up to
+    `request_limit` at once.
+
+    Every slot expires after `timeout` seconds, so the slots of a request
+    that never released them (a worker that died mid-request) are reclaimed.
+    With redis they are members of a sorted set scored by their expiry,
+    without it they are kept per process.
+    """
+
+    acquire_script_source = """
+    local now = tonumber(ARGV[1])
+    local timeout = tonumber(ARGV[2])
+    local request_limit = tonumber(ARGV[3])
+
+    redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now)
+    if redis.call("ZCARD", KEYS[1]) >= request_limit then
+        return 0
+    end
+
+    redis.call("ZADD", KEYS[1], now + timeout, ARGV[4])
+    redis.call("EXPIRE", KEYS[1], math.ceil(timeout))
+    return 1
+    """
+
+    # Expiry of each slot per cache key, when there is no redis
+    _local_in_flight: defaultdict[str, dict[str, float]] = defaultdict(dict)
+    _local_lock = threading.Lock()
+
+    def __init__(self, ident: str, cache_scope: str, timeout=60, request_limit=5):
+        self.ident = ident
+        self.cache_key = f"throttle_concurrency_{cache_scope}_{ident}"
+        self.timeout = timeout
+        self.request_limit = request_limit
+        self.client = get_redis_client()
+        self.token = uuid.uuid4().hex
+        self.acquired = False
+
+    def acquire(self) -> bool:
+        """
+        Take a slot, if one is free
+        """
+        now = timezone.now().timestamp()
+        if self.client is None:
+            with self._local_lock:
+                slots = self._local_in_flight[self.cache_key]
+                for token, expires_at in list(slots.items()):
+                    if expires_at <= now:
+                        del slots[token]
+                if len(slots) >= self.request_limit:
+                    return False
+                slots[self.token] = now + self.timeout
+        else:
+            acquired = run_redis_script(
+                self.client,
+                self.acquire_script_source,
+                keys=[cache.make_key(self.cache_key)],
+                args=[now, self.timeout, self.request_limit, self.token],
+            )
+            if not acquired:
+                return False
+
+        self.acquired = True
+        return True
+
+    def release(self):
+        """
+        Give the slot back
+        """
+        if not self.acquired:
+            return
+
+        self.acquired = False
+        if self.client is None:
+            with self._local_lock:
+                slots = self._local_in_flight[self.cache_key]
+                slots.pop(self.token, None)
+                if not slots:
+                    del self._local_in_flight[self.cache_key]
+            return
+
+        try:
+            self.client.zrem(cache.make_key(self.cache_key), self.token)
+        except RedisError:
+            # The slot expires on its own
+            logger.warning("Could not release %s", self.cache_key, exc_info=True)
+
+
+THROTTLE_ALGORITHMS = {
+    "escalating": AtomicThrottleCache,
+    "gcra": GCRAThrottleCache,
+    "sliding_window": SlidingWindowThrottleCache,
+}
+
+DEFAULT_THROTTLE_POLICY = {
+    "algorithm": "escalating",
+    "timeout": 60,
+    "request_limit": 5,
+    "shadow": False,
+}
+
+
+def get_user_tier(user) -> str:
+    """
+    Returns the tier of the user used to pick the throttle policy
+    """
+    if not user or not user.is_authenticated:
+        return "anonymous"
+    if user.is_superuser:
+        return "superuser"
+    if user.is_staff:
+        return "staff"
+    return "user"
+
+
+def get_throttle_policy(scope: str, tier: str | None = None) -> dict | None:
+    """
+    Returns the throttle policy of a scope from `THROTTLE_SCOPES` setting,
+    filled up with the defaults.
+
+    A scope can override its policy per user tier under "tiers". A tier set
+    to `None` is not throttled, in which case `None` is returned.
+
+    `THROTTLE_SHADOW_MODE` setting puts every scope in shadow mode unless
+    the scope says otherwise.
+    """
+    scopes = getattr(settings, "THROTTLE_SCOPES", {})
+    policy = {
+        **DEFAULT_THROTTLE_POLICY,
+        "shadow": getattr(settings, "THROTTLE_SHADOW_MODE", False),
+        **scopes.get(scope, {}),
+    }
+    tiers = policy.pop("tiers", {})
+
+    if tier in tiers:
+        if tiers[tier] is None:
+            return None
+        policy.update(tiers[tier])
+
+    return policy
+
+
+def get_throttle_algorithm(name: str):
+    """
+    Returns the throttle cache class of an algorithm. Accepts either one of
+    `THROTTLE_ALGORITHMS` or a dotted path to a custom class.
+    """
+    if name in THROTTLE_ALGORITHMS:
+        return THROTTLE_ALGORITHMS[name]
+    return import_string(name)
+
+
+THROTTLE_RESET_GENERATION_KEY = "throttle_reset_generation"
+
+
+class LocalDenyCache:
+    """
+    Bounded per-process LRU of throttled idents and the timestamp they are
+    released at. Repeated requests from an ident we already know is throttled
+    are rejected without any network I/O until the release timestamp.
+
+    `reset_throttle` bumps a generation number in cache; workers holding
+    entries check it at most every `sync_interval` seconds and drop
+    everything when it changes. The generation is read when the first entry
+    is added, so resets that happened before are not mistaken for new ones.
+    """
+
+    def __init__(self, max_size=10_000, sync_interval=1):
+        self.max_size = max_size
+        self.sync_interval = sync_interval
+        self._entries: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = None
+        self._synced_at = 0.0
+
+    def _sync(self, now: float, *, force=False):
+        if not force and now - self._synced_at < self.sync_interval:
+            return
+
+        self._synced_at = now
+        generation = cache.get(THROTTLE_RESET_GENERATION_KEY)
+        if generation != self._generation:
+            self._generation = generation
+            self._entries.clear()
+
+    def get(self, key: str) -> float | None:
+        """
+        Returns the release timestamp of a throttled key, if any
+        """
+        if not self._entries:
+            return None
+
+        now = timezone.now().timestamp()
+        with self._lock:
+            self._sync(now)
+            release_at = self._entries.get(key)
+            if release_at is None:
+                return None
+            if release_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return release_at
+
+    def add(self, key: str, release_at: float):
+        with self._lock:
+            if not self._entries:
+                # Nothing to drop, start from the current generation
+                self._sync(timezone.now().timestamp(), force=True)
+            self._entries[key] = release_at
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+local_deny_cache = LocalDenyCache(
+    max_size=getattr(settings, "THROTTLE_DENY_CACHE_SIZE", 10_000),
+    sync_interval=getattr(settings, "THROTTLE_DENY_CACHE_SYNC_INTERVAL", 1),
+)
+
+
+class ThrottleDecisionCounter:
+    """
+    Counts the throttle decisions per scope in process memory and writes them
+    to cache in a single batch at most every `flush_interval` seconds, so
+    recording a decision costs no I/O on the request path.
+
+    With redis the counts of a scope are kept in the hash
+    `throttle_decisions_{scope}`, one field per decision.
+    """
+
+    decisions = ("allowed", "throttled", "escalated")
+
+    def __init__(self, flush_interval=10):
+        self.flush_interval = flush_interval
+        self._counts: Counter[tuple[str, str]] = Counter()
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+
+    def _pop_counts(self) -> Counter:
+        counts, self._counts = self._counts, Counter()
+        self._flushed_at = time.monotonic()
+        return counts
+
+    def increment(self, scope: str, decision: str):
+        with self._lock:
+            self._counts[(scope, decision)] += 1
+            if time.monotonic() - self._flushed_at < self.flush_interval:
+                return
+            counts = self._pop_counts()
+
+        self._write(counts)
+
+    def flush(self):
+        """
+        Write the pending counts to cache
+        """
+        with self._lock:
+            counts = self._pop_counts()
+
+        self._write(counts)
+
+    def _write(self, counts: Counter):
+        if not counts:
+            return
+
+        client = get_redis_client()
+        if client is None:
+            for (scope, decision), count in counts.items():
+                key = f"throttle_decisions_{scope}_{decision}"
+                if not cache.add(key, count, None):
+                    cache.incr(key, count)
+            return
+
+        try:
+            pipeline = client.pipeline(transaction=False)
+            for (scope, decision), count in counts.items():
+                pipeline.hincrby(
+                    cache.make_key(f"throttle_decisions_{scope}"),
+                    decision,
+                    count,
+                )
+            pipeline.execute()
+        except RedisError:
+            logger.warning("Could not write throttle decision counts", exc_info=True)
+
+    def get_counts(self, scope: str) -> dict[str, int]:
+        """
+        Returns the flushed decision counts of a scope
+        """
+        client = get_redis_client()
+        if client is None:
+            return {
+                decision: cache.get(f"throttle_decisions_{scope}_{decision}", 0)
+                for decision in self.decisions
+            }
+
+        data = client.hgetall(cache.make_key(f"throttle_decisions_{scope}"))
+        return {
+            decision: int(data.get(decision.encode(), 0)) for decision in self.decisions
+        }
+
+
+throttle_decision_counter = ThrottleDecisionCounter(
+    flush_interval=getattr(settings, "THROTTLE_DECISION_FLUSH_INTERVAL", 10),
+)
+atexit.register(throttle_decision_counter.flush)
+
+
+def get_throttle_decision_counts(scope: str) -> dict[str, int]:
+    """
+    Returns how many requests of a scope were allowed, throttled or throttled
+    again with an escalated wait time, as flushed by every worker so far
+    """
+    return throttle_decision_counter.get_counts(scope)
+
+
+def reset_throttle(scope: str, ident: str, tier: str | None = None):
+    """
+    Clears the throttle data of an ident and tells every worker to drop the
+    idents they are denying locally
+    """
+    policy = get_throttle_policy(scope, tier)
+    if policy is not None:
+        throttle_cache_class = get_throttle_algorithm(policy["algorithm"])
+        throttle_cache_class(
+            ident,
+            scope,
+            timeout=policy["timeout"],
+            request_limit=policy["request_limit"],
+        ).reset()
+
+    local_deny_cache.discard(f"{scope}_{ident}")
+    if not cache.add(THROTTLE_RESET_GENERATION_KEY, 1, None):
+        cache.incr(THROTTLE_RESET_GENERATION_KEY)
+
+
 class AnonymousRequestThrottles(BaseThrottle):
-    throttle_cache: ThrottleCache
+    throttle_cache: (
+        ThrottleCache | GCRAThrottleCache | SlidingWindowThrottleCache | None
+    )
+    release_at: float | None = None
     scope = "anonymous"
 
     def allow_request(self, request, view):
-        ident = self.get_ident(request)
-        self.throttle_cache = ThrottleCache(ident, self.scope)
+        if request.user.is_authenticated:
+            return True
 
-        should_throttle_request = self.throttle_cache.should_throttle_request()
+        if self.scope in getattr(request, "evaluated_throttle_scopes", ()):
+            # Already counted by `ThrottleMiddleware`
+            return True
+
+        return self.evaluate(self.get_ident(request))
 
-        self.throttle_cache.register_request()
+    def is_denied(self, ident: str) -> bool:
+        """
+        Whether the ident is known to be throttled by this process
+        """
+        self.throttle_cache = None
+        self.release_at = local_deny_cache.get(f"{self.scope}_{ident}")
+        return bool(self.release_at)
 
-        if (should_throttle_request and self.throttle_cache.allow_request_after < 0) or request.user.is_authenticated:
-            self.throttle_cache.reset_throttle_data()
+    def evaluate(self, ident: str, policy: dict | None = None, cost=1) -> bool:
+        """
+        Register a request of the ident, using up `cost` of its budget, and
+        decide whether it is allowed.
+
+        In shadow mode the decision is counted but the request is always
+        allowed.
+        """
+        policy = policy or get_throttle_policy(self.scope, "anonymous")
+        if policy is None:
             return True
 
-        return not should_throttle_request
+        if not policy["shadow"] and self.is_denied(ident):
+            throttle_decision_counter.increment(self.scope, "throttled")
+            return False
+
+        throttle_cache_class = get_throttle_algorithm(policy["algorithm"])
+        self.throttle_cache = throttle_cache_class(
+            ident,
+            self.scope,
+            timeout=policy["timeout"],
+            request_limit=policy["request_limit"],
+        )
+
+        try:
+            allowed = self.throttle_cache.evaluate(cost=cost)
+        except RedisError:
+            # Fail open like the cache does with IGNORE_EXCEPTIONS
+            logger.warning("Could not evaluate throttle for %s", ident, exc_info=True)
+            return True
+
+        if allowed:
+            decision = "allowed"
+        elif getattr(self.throttle_cache, "escalated", False):
+            decision = "escalated"
+        else:
+            decision = "throttled"
+        throttle_decision_counter.increment(self.scope, decision)
+
+        if policy["shadow"]:
+            return True
+
+        # A cheaper request of the same scope may still fit in the budget
+        if not allowed and cost <= 1 and self.throttle_cache.allow_request_after > 0:
+            local_deny_cache.add(
+                f"{self.scope}_{ident}",
+                timezone.now().timestamp() + self.throttle_cache.allow_request_after,
+            )
+
+        return allowed
 
     def wait(self):
+        if self.release_at:
+            return max(self.release_at - timezone.now().timestamp(), 0)
+
         if not self.throttle_cache:
             return 0
 
         return self.throttle_cache.allow_request_after
+
+
+class ScopedRequestThrottles(AnonymousRequestThrottles):
+    """
+    Throttles the views and actions declaring a `throttle_scope`, with the
+    policy of that scope and the user tier from `THROTTLE_SCOPES`.
+
+    Authenticated users are throttled per user, anonymous ones per ident.
+    Views and actions sharing a scope can declare a `throttle_cost` so the
+    expensive ones use up more of the budget.
+    """
+
+    scope = None
+
+    def get_ident(self, request):
+        if request.user.is_authenticated:
+            return f"user_{request.user.pk}"
+        return super().get_ident(request)
+
+    def allow_request(self, request, view):
+        self.scope = getattr(view, "throttle_scope", None)
+        if not self.scope:
+            return True
+
+        if self.scope in getattr(request, "evaluated_throttle_scopes", ()):
+            return True
+
+        policy = get_throttle_policy(self.scope, get_user_tier(request.user))
+        if policy is None:
+            return True
+
+        cost = getattr(view, "throttle_cost", 1)
+        return self.evaluate(self.get_ident(request), policy, cost)
+
+
+def release_concurrency_slots(request):
+    """
+    Release the slots taken by `ConcurrentRequestThrottles` for a request
+    """
+    for limiter in request.__dict__.pop("concurrency_limiters", ()):
+        limiter.release()
+
+
+class _ReleaseOnClose:
+    """
+    Streaming content releasing the concurrency slots of its request when the
+    server closes the response, once the content is sent or the client left
+    """
+
+    def __init__(self, content, request):
+        self.content = content
+        self.request = request
+
+    def __iter__(self):
+        return iter(self.content)
+
+    def close(self):
+        release_concurrency_slots(self.request)
+
+
+def release_concurrency_slots_with(response, request):
+    """
+    Release the slots of a request once its response is done with: right
+    away, or once the content of a streaming response is streamed
+    """
+    if response.streaming and not response.is_async:
+        response.streaming_content = _ReleaseOnClose(
+            response.streaming_content,
+            request,
+        )
+    else:
+        release_concurrency_slots(request)
+
+
+def _release_on_finalize(view):
+    """
+    Release the slots of the request once the view finalizes its response.
+    The throttle runs for every view, so it hooks the view instance.
+    """
+    finalize_response = view.finalize_response
+
+    def finalize_and_release(request, response, *args, **kwargs):
+        response = finalize_response(request, response, *args, **kwargs)
+        release_concurrency_slots_with(response, request._request)  # noqa: SLF001
+        return response
+
+    view.finalize_response = finalize_and_release
+
+
+class ConcurrentRequestThrottles(ScopedRequestThrottles):
+    """
+    Caps the in-flight requests per user (or ident when anonymous) with the
+    "concurrency" policy of `THROTTLE_SCOPES`, so a client with slow requests
+    cannot hold every worker thread. Only "timeout" (the lifetime of a slot)
+    and "request_limit" of the policy are used.
+
+    The slots are released once the view finalizes its response, or once the
+    content of a streaming response is streamed. `ConcurrencyLimitMiddleware`
+    releases them when the view raises instead.
+    """
+
+    scope = "concurrency"
+
+    def allow_request(self, request, view):
+        policy = get_throttle_policy(self.scope, get_user_tier(request.user))
+        if policy is None:
+            return True
+
+        limiter = ConcurrencyLimiter(
+            self.get_ident(request),
+            self.scope,
+            timeout=policy["timeout"],
+            request_limit=policy["request_limit"],
+        )
+        try:
+            allowed = limiter.acquire()
+        except RedisError:
+            logger.warning("Could not acquire %s", limiter.cache_key, exc_info=True)
+            return True
+
+        throttle_decision_counter.increment(
+            self.scope,
+            "allowed" if allowed else "throttled",
+        )
+        if allowed:
+            # Stored on the django request so the middleware can reach it
+            limiters = request._request.__dict__.setdefault("concurrency_limiters", [])  # noqa: SLF001
+            if not limiters:
+                _release_on_finalize(view)
+            limiters.append(limiter)
+
+        return allowed or policy["shadow"]
+
+    def wait(self):
+        # A slot is usually freed by the end of a request
+        return 1
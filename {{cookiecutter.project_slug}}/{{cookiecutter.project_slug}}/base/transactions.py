@@ -0,0 +1,101 @@
+import functools
+from contextlib import ExitStack
+
+from django.db import connections
+from django.db import transaction
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def atomic_requests() -> ExitStack:
+    """
+    Returns a context manager running its block in a transaction on every
+    database with ATOMIC_REQUESTS, as Django does around a view
+    """
+    stack = ExitStack()
+    for alias, settings_dict in connections.settings.items():
+        if settings_dict.get("ATOMIC_REQUESTS"):
+            stack.enter_context(transaction.atomic(using=alias))
+    return stack
+
+
+def non_atomic_requests(view):
+    """
+    Runs a view outside ATOMIC_REQUESTS on every database, as
+    `transaction.non_atomic_requests` does for one
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return view(request, *args, **kwargs)
+
+    wrapper._non_atomic_requests = set(connections.settings)  # noqa: SLF001
+    return wrapper
+
+
+def non_atomic_safe_requests(view):
+    """
+    Runs the GET, HEAD and OPTIONS requests of a view in autocommit mode,
+    sparing them the BEGIN/COMMIT of ATOMIC_REQUESTS. Other methods still
+    run in a transaction.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method in SAFE_METHODS:
+            return view(request, *args, **kwargs)
+        with atomic_requests():
+            return view(request, *args, **kwargs)
+
+    wrapper._non_atomic_requests = set(connections.settings)  # noqa: SLF001
+    return wrapper
+
+
+def non_atomic_urls(urls: tuple) -> tuple:
+    """
+    Makes Django run the views of `api.urls` outside ATOMIC_REQUESTS, so
+    `atomic_operation` decides per operation instead
+    """
+    patterns, app_name, namespace = urls
+    for pattern in patterns:
+        pattern.callback = non_atomic_requests(pattern.callback)
+    return patterns, app_name, namespace
+
+
+def atomic_operation(run):
+    """
+    Django Ninja API decorator, `api.add_decorator(atomic_operation, mode="view")`.
+    Runs every operation in the ATOMIC_REQUESTS transaction except the safe
+    ones of the routers decorated with `non_atomic_safe_router`.
+    """
+
+    @functools.wraps(run)
+    def wrapper(request, *args, **kwargs):
+        if request.method in SAFE_METHODS and getattr(
+            request,
+            "non_atomic_safe_requests",
+            False,
+        ):
+            return run(request, *args, **kwargs)
+        with atomic_requests():
+            return run(request, *args, **kwargs)
+
+    return wrapper
+
+
+def _mark_non_atomic_safe(run):
+    @functools.wraps(run)
+    def wrapper(request, *args, **kwargs):
+        request.non_atomic_safe_requests = True
+        return run(request, *args, **kwargs)
+
+    return wrapper
+
+
+def non_atomic_safe_router(router):
+    """
+    Django Ninja counterpart of `non_atomic_safe_requests` for all the
+    operations of a router, `router = non_atomic_safe_router(Router())`
+    """
+    router.add_decorator(_mark_non_atomic_safe, mode="view")
+    return router
@@ -0,0 +1,128 @@
+import logging
+import uuid
+from operator import methodcaller
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+EMPTY_TRASH = "empty_trash"
+RESTORE_ALL = "restore_all"
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+def _get_job_key(job_id: str) -> str:
+    return f"trash_job_{job_id}"
+
+
+def _save_job(job: dict):
+    cache.set(
+        _get_job_key(job["id"]),
+        job,
+        getattr(settings, "TRASH_JOB_TIMEOUT", 60 * 60 * 24),
+    )
+
+
+def get_trash_job(job_id: str) -> dict | None:
+    """
+    Returns the status and progress of a job, None once it expired
+    """
+    return cache.get(_get_job_key(job_id))
+
+
+def create_trash_job(model, action: str, user_id=None, viewset=None) -> dict:
+    """
+    Registers a job emptying the trash of a model or restoring all of it, to
+    be run by `run_trash_job`. The dotted path of a `viewset` makes its
+    `restore_queryset` restore the batches.
+    """
+    job = {
+        "id": uuid.uuid4().hex,
+        "model": model._meta.label_lower,  # noqa: SLF001
+        "action": action,
+        "user_id": user_id,
+        "viewset": viewset,
+        "status": PENDING,
+        "total": model.objects.deleted().count(),
+        "processed": 0,
+        "affected": 0,
+        "error": None,
+    }
+    _save_job(job)
+    return job
+
+
+def run_trash_job(job_id: str, batch_size: int | None = None) -> dict | None:
+    """
+    Runs a job in batches of `batch_size` deleted rows in pk order, each in its
+    own short transaction, saving the progress after each batch. Locked rows
+    are skipped by `hard_delete`, restored rows are counted once the batch's
+    `restore_queryset` ran.
+    """
+    job = get_trash_job(job_id)
+    if job is None or job["status"] != PENDING:
+        return job
+
+    if batch_size is None:
+        batch_size = getattr(settings, "TRASH_JOB_BATCH_SIZE", 1000)
+
+    model = apps.get_model(job["model"])
+    skip_log_key = f"skip_log_report_activity:{job['user_id']}"
+    job["status"] = RUNNING
+    _save_job(job)
+
+    try:
+        if job.get("viewset"):
+            restore_queryset = import_string(job["viewset"])().restore_queryset
+        else:
+            restore_queryset = methodcaller("restore")
+
+        last_pk = None
+        while True:
+            queryset = model.objects.deleted().order_by("pk")
+            if last_pk is not None:
+                queryset = queryset.filter(pk__gt=last_pk)
+            pks = list(queryset.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+
+            cache.set(skip_log_key, value=True, timeout=60)
+            with transaction.atomic():
+                batch = model.objects.all_objects().filter(pk__in=pks, is_deleted=True)
+                if job["action"] == EMPTY_TRASH:
+                    affected, _ = batch.hard_delete()
+                else:
+                    restore_queryset(batch)
+                    affected = len(pks) - batch.count()
+
+            last_pk = pks[-1]
+            job["processed"] += len(pks)
+            job["affected"] += affected
+            _save_job(job)
+    except Exception as e:
+        logger.exception("Trash job %s of %s failed", job["action"], job["model"])
+        job["status"] = FAILED
+        job["error"] = str(e)
+        _save_job(job)
+        raise
+    finally:
+        cache.delete(skip_log_key)
+
+    logger.info(
+        "Trash job %s of %s done: %s rows processed, %s affected",
+        job["action"],
+        job["model"],
+        job["processed"],
+        job["affected"],
+    )
+    job["status"] = DONE
+    _save_job(job)
+    return job
@@ -0,0 +1,28 @@
+import time
+
+from gunicorn.workers.gthread import ThreadWorker
+
+
+class QueueTimingThreadWorker(ThreadWorker):
+    """
+    gthread worker stamping the requests with `X-Request-Start`, backdated by
+    the time their connection waited for a free thread, so
+    `LoadSheddingMiddleware` sees the queueing delay without a proxy sending
+    the header. A header sent by the proxy is kept, it also counts the time
+    spent queued in the proxy.
+    """
+
+    def enqueue_req(self, conn):
+        conn.enqueued_at = time.time()
+        super().enqueue_req(conn)
+
+    def handle(self, conn):
+        # Runs once a thread is free
+        conn.queue_delay = time.time() - conn.enqueued_at
+        return super().handle(conn)
+
+    def handle_request(self, req, conn):
+        if not any(name == "X-REQUEST-START" for name, _ in req.headers):
+            request_start = time.time() - conn.queue_delay
+            req.headers.append(("X-REQUEST-START", f"t={request_start:.6f}"))
+        return super().handle_request(req, conn)